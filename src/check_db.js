@@ -1,6 +1,6 @@
 // Quick sanity report on market.db contents.
 const { openDb } = require('./db');
-const db = openDb();
+const db = openDb({ readOnly: true });
 
 const weather = db.prepare(`
   SELECT model, var, COUNT(*) n, ROUND(AVG(value), 1) avg
@@ -23,3 +23,84 @@ const series = db.prepare(`
 `).all();
 console.log(`series table: ${series.length} series`);
 if (series.length) console.table(series);
+
+// energy balance per interval: generation - load - pumping should roughly match net physical export.
+// One conditional-aggregation pass over the recent days instead of pivoting rows in JS.
+// gen_actual_<psr>_consumption is A75 pumped-storage LOAD (entsoe.js parseDocument), netted out like the flow legs.
+const DAYS = Number(process.argv[2] || 7);
+const balance = db.prepare(`
+  SELECT date_ro, isp, ROUND(gen) gen, ROUND(pump) pump, ROUND(load) load, ROUND(net_exp) net_exp,
+         ROUND(gen - pump - load - net_exp) resid
+  FROM (
+    SELECT date_ro, isp,
+      SUM(CASE WHEN series LIKE 'gen_actual_%' AND series NOT LIKE '%\\_consumption' ESCAPE '\\' THEN value END) gen,
+      TOTAL(CASE WHEN series LIKE '%\\_consumption' ESCAPE '\\' THEN value END) pump,
+      SUM(CASE WHEN series = 'load_actual' THEN value END) load,
+      TOTAL(CASE WHEN series LIKE 'flow_RO_%' THEN value WHEN series LIKE 'flow_%_RO' THEN -value END) net_exp
+    FROM series
+    WHERE date_ro >= date('now', ?) AND (series LIKE 'gen_actual_%' OR series = 'load_actual' OR series LIKE 'flow_%')
+    GROUP BY date_ro, isp
+  )
+  WHERE gen IS NOT NULL AND load IS NOT NULL AND ABS(gen - pump - load - net_exp) > 0.1 * load
+  ORDER BY ABS(gen - pump - load - net_exp) DESC LIMIT 20
+`).all(`-${DAYS} days`);
+console.log(`energy balance outliers (last ${DAYS} days, |resid| > 10% of load): ${balance.length}`);
+if (balance.length) console.table(balance);
+
+// duplicate (series, date_ro, isp) slots — two UTC stamps mapped to one ISP (DST mix-ups).
+// The database does the grouping; offending rows are only fetched when there are any.
+const dups = db.prepare(`
+  SELECT series, date_ro, isp, COUNT(*) n FROM series
+  WHERE date_ro >= date('now', ?)
+  GROUP BY series, date_ro, isp HAVING COUNT(*) > 1
+  ORDER BY date_ro DESC, series, isp LIMIT 50
+`).all(`-${DAYS} days`);
+console.log(`duplicate ISP slots (last ${DAYS} days): ${dups.length}`);
+if (dups.length) {
+  console.table(dups);
+  const dupRow = db.prepare('SELECT series, ts_utc, date_ro, isp, value FROM series WHERE series=? AND date_ro=? AND isp=? ORDER BY ts_utc');
+  console.table(dups.slice(0, 5).flatMap((d) => dupRow.all(d.series, d.date_ro, d.isp)));
+}
+
+// flatlined days: one value repeated across most of a day usually means a stale placeholder
+const flat = db.prepare(`
+  SELECT series, date_ro, value, COUNT(*) n FROM series
+  WHERE date_ro >= date('now', ?) AND value <> 0
+  GROUP BY series, date_ro, value HAVING COUNT(*) > 48
+  ORDER BY date_ro DESC, series LIMIT 50
+`).all(`-${DAYS} days`);
+console.log(`flatlined series-days (same non-zero value > 48 ISPs): ${flat.length}`);
+if (flat.length) console.table(flat);
+
+// missing intervals: anti-join a generated 15-min UTC grid against the core series
+const GAP_SERIES = ['damas_est_sys_imbalance', 'damas_est_price_pos', 'load_actual', 'da_price'];
+const gapStmt = db.prepare(`
+  WITH RECURSIVE grid(ts) AS (
+    SELECT strftime('%Y-%m-%dT%H:%M:%S.000Z', date('now', ?))
+    UNION ALL
+    SELECT strftime('%Y-%m-%dT%H:%M:%S.000Z', ts, '+15 minutes') FROM grid
+    WHERE ts < strftime('%Y-%m-%dT%H:%M:%S.000Z', 'now', '-2 hours')
+  )
+  SELECT COUNT(*) missing, MIN(grid.ts) first_missing, MAX(grid.ts) last_missing FROM grid
+  LEFT JOIN series s ON s.series = ? AND s.ts_utc = grid.ts
+  WHERE s.ts_utc IS NULL
+`);
+const gaps = GAP_SERIES.map((s) => ({ series: s, ...gapStmt.get(`-${DAYS} days`, s) }));
+console.log(`missing 15-min intervals (last ${DAYS} days):`);
+console.table(gaps);
+
+// live-capture breaks: sen_live (the 24/7 SCADA logger) has no fixed grid for the anti-join above, so LAG() over its
+// own stamps finds the holes — only the breaks come back (zero rows while the logger is healthy)
+const LIVE_GAP_MIN = 10;
+try {
+  const breaks = db.prepare(`
+    SELECT prev_feed, ts_feed, ROUND((ts_ms - prev_ms) / 60000.0) gap_min FROM (
+      SELECT ts_feed, ts_ms, LAG(ts_feed) OVER w prev_feed, LAG(ts_ms) OVER w prev_ms
+      FROM sen_live WHERE ts_ms >= ? WINDOW w AS (ORDER BY ts_ms)
+    )
+    WHERE ts_ms - prev_ms > ?
+    ORDER BY ts_ms DESC LIMIT 50
+  `).all(Date.now() - DAYS * 86400000, LIVE_GAP_MIN * 60000);
+  console.log(`sen_live capture breaks > ${LIVE_GAP_MIN} min (last ${DAYS} days): ${breaks.length}`);
+  if (breaks.length) console.table(breaks);
+} catch { console.log('sen_live: no live-capture table yet'); }
@@ -32,8 +32,12 @@ const FEAT_FWD = [...GROUPS.B, ...GROUPS.C, ...GROUPS.D, ...GROUPS.E];
 
 // ---- load all series into ts->value maps (first_value for forward/anti-leak, value for settled) ----
 function load(db) {
-  const serFirst = (name) => new Map(db.prepare('SELECT ts_utc, first_value v FROM series WHERE series=? AND first_value IS NOT NULL').all(name).map((r) => [Date.parse(r.ts_utc), r.v]));
-  const serVal = (name) => new Map(db.prepare('SELECT ts_utc, value v FROM series WHERE series=? AND value IS NOT NULL').all(name).map((r) => [Date.parse(r.ts_utc), r.v]));
+  // stream rows straight into the maps (no intermediate row array + mapped pair array per series)
+  const firstStmt = db.prepare('SELECT ts_utc, first_value v FROM series WHERE series=? AND first_value IS NOT NULL');
+  const valStmt = db.prepare('SELECT ts_utc, value v FROM series WHERE series=? AND value IS NOT NULL');
+  const toMap = (stmt, name) => { const m = new Map(); for (const r of stmt.iterate(name)) m.set(Date.parse(r.ts_utc), r.v); return m; };
+  const serFirst = (name) => toMap(firstStmt, name);
+  const serVal = (name) => toMap(valStmt, name);
   const imbRows = db.prepare("SELECT ts_utc, isp, value FROM series WHERE series='damas_est_sys_imbalance' AND value IS NOT NULL ORDER BY ts_utc").all();
   const ms = imbRows.map((r) => Date.parse(r.ts_utc));
   const N = ms.length;
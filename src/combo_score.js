@@ -154,40 +154,53 @@ function main() {
   const priceAt = db.prepare("SELECT value v FROM series WHERE series='damas_est_price_pos' AND ts_utc=?");
   const upd = db.prepare(`UPDATE combo_pred SET realized_imb=?, realized_surplus=?, realized_price=?,
     model_correct=?, persist_correct=?, pnl_ron=? WHERE kind=? AND ts_utc=?`);
-  const pending = db.prepare('SELECT kind, ts_utc, isp, pred_surplus, conf, qty, da_ref, persist_surplus FROM combo_pred WHERE realized_imb IS NULL');
+  // keyset pages of 1000 pending rows by rowid, each read in full and then updated + committed: a long backlog never
+  // sits in memory at once, a crash keeps what was already scored, and no SELECT is open while combo_pred changes
+  const pending = db.prepare(`SELECT rowid rid, kind, ts_utc, isp, pred_surplus, conf, qty, da_ref, persist_surplus FROM combo_pred
+    WHERE realized_imb IS NULL AND rowid > ? ORDER BY rowid LIMIT 1000`);
   let nScored = 0;
-  db.exec('BEGIN');
-  for (const r of pending.all()) {
-    const imb = imbAt.get(r.ts_utc)?.v; if (imb === undefined || imb === null) continue;
-    const realizedSurplus = imb > 0 ? 1 : 0;
-    const price = priceAt.get(r.ts_utc)?.v ?? null;
-    const modelCorrect = (r.pred_surplus === 1) === (realizedSurplus === 1) ? 1 : 0;
-    const persistCorrect = r.persist_surplus === null ? null : ((r.persist_surplus === 1) === (realizedSurplus === 1) ? 1 : 0);
-    // hypothetical paper P&L: predict deficit (pred_surplus=0) -> qty=+V (profits when imb price>PZU);
-    // predict surplus -> qty=-V. pnl = qty_signed*(realized_price - da_ref). null if price/da_ref missing.
-    let pnl = null;
-    if (price !== null && r.da_ref !== null) { const signed = r.pred_surplus === 1 ? -r.qty : r.qty; pnl = +(signed * (price - r.da_ref)).toFixed(2); }
-    upd.run(imb, realizedSurplus, price, modelCorrect, persistCorrect, pnl, r.kind, r.ts_utc);
-    nScored++;
+  for (let after = 0, page; (page = pending.all(after)).length; after = page[page.length - 1].rid) {
+    db.exec('BEGIN');
+    try {
+      for (const r of page) {
+        const imb = imbAt.get(r.ts_utc)?.v; if (imb === undefined || imb === null) continue;
+        const realizedSurplus = imb > 0 ? 1 : 0;
+        const price = priceAt.get(r.ts_utc)?.v ?? null;
+        const modelCorrect = (r.pred_surplus === 1) === (realizedSurplus === 1) ? 1 : 0;
+        const persistCorrect = r.persist_surplus === null ? null : ((r.persist_surplus === 1) === (realizedSurplus === 1) ? 1 : 0);
+        // hypothetical paper P&L: predict deficit (pred_surplus=0) -> qty=+V (profits when imb price>PZU);
+        // predict surplus -> qty=-V. pnl = qty_signed*(realized_price - da_ref). null if price/da_ref missing.
+        let pnl = null;
+        if (price !== null && r.da_ref !== null) { const signed = r.pred_surplus === 1 ? -r.qty : r.qty; pnl = +(signed * (price - r.da_ref)).toFixed(2); }
+        upd.run(imb, realizedSurplus, price, modelCorrect, persistCorrect, pnl, r.kind, r.ts_utc);
+        nScored++;
+      }
+      db.exec('COMMIT');
+    } catch (e) { db.exec('ROLLBACK'); throw e; }
   }
-  db.exec('COMMIT');
 
   console.log(`${now}: combo_pred +${nIntra} intraday / +${nD1} d1 frozen, ${nScored} scored`);
 
   // ---- rolling scorecard (all scored history) ----
+  const cardStmt = db.prepare('SELECT model_correct, persist_correct, realized_surplus, pnl_ron, qty FROM combo_pred WHERE kind=? AND realized_imb IS NOT NULL');
   const card = (kind) => {
-    const rows = db.prepare('SELECT * FROM combo_pred WHERE kind=? AND realized_imb IS NOT NULL').all(kind);
+    const rows = cardStmt.all(kind);
     if (!rows.length) return `${kind}: no scored rows yet`;
-    const acc = rows.reduce((s, r) => s + r.model_correct, 0) / rows.length;
+    // one pass for every tally; the d1 majority baseline needs the surplus share first, then a closed form
+    let correct = 0, persist = 0, surplus = 0, pnl = 0, mwh = 0, nPnl = 0;
+    for (const r of rows) {
+      correct += r.model_correct;
+      persist += r.persist_correct || 0;
+      surplus += r.realized_surplus;
+      if (r.pnl_ron !== null) { pnl += r.pnl_ron; mwh += Math.abs(r.qty); nPnl++; }
+    }
+    const acc = correct / rows.length;
     const base = kind === 'intraday'
-      ? rows.reduce((s, r) => s + (r.persist_correct || 0), 0) / rows.length
-      : rows.reduce((s, r) => s + ((r.realized_surplus === 1) === (rows.reduce((a, x) => a + x.realized_surplus, 0) >= rows.length / 2) ? 1 : 0), 0) / rows.length;
-    const pnlRows = rows.filter((r) => r.pnl_ron !== null);
-    const pnl = pnlRows.reduce((s, r) => s + r.pnl_ron, 0);
-    const mwh = pnlRows.reduce((s, r) => s + Math.abs(r.qty), 0);
+      ? persist / rows.length
+      : (surplus >= rows.length / 2 ? surplus : rows.length - surplus) / rows.length;
     const baseLabel = kind === 'intraday' ? 'persist' : 'majority';
     return `${kind}: n=${rows.length} acc=${(acc * 100).toFixed(1)}% vs ${baseLabel} ${(base * 100).toFixed(1)}%`
-      + (mwh ? ` | paper P&L ${Math.round(pnl).toLocaleString()} RON (${(pnl / mwh).toFixed(0)} RON/MWh, n=${pnlRows.length})` : '');
+      + (mwh ? ` | paper P&L ${Math.round(pnl).toLocaleString()} RON (${(pnl / mwh).toFixed(0)} RON/MWh, n=${nPnl})` : '');
   };
   console.log('  ' + card('intraday'));
   console.log('  ' + card('d1'));
@@ -8,13 +8,34 @@ const DATA_DIR = process.env.DATA_DIR || path.join(__dirname, '..', 'data');
 require('fs').mkdirSync(DATA_DIR, { recursive: true });
 const DB_PATH = path.join(DATA_DIR, 'market.db');
 
-function openDb() {
-  const db = new DatabaseSync(DB_PATH);
+// Read-side tuning shared by every read-only handle: the file is memory-mapped (up to 256 MB) so repeated scans read
+// pages straight from the OS cache, a 64 MB page cache, and sorts/temp b-trees for GROUP BY kept in memory.
+function tuneReadOnly(db) {
+  db.exec('PRAGMA busy_timeout = 60000; PRAGMA mmap_size = 268435456; PRAGMA cache_size = -65536; PRAGMA temp_store = MEMORY;');
+  return db;
+}
+
+// readOnly: for report/verification scripts — no schema setup or journal changes, tuned by tuneReadOnly.
+// One connection per mode per process: modules that each call openDb() share it, and the pragmas + schema DDL
+// below run once instead of on every call.
+const conns = new Map();
+function openDb({ readOnly = false } = {}) {
+  let db = conns.get(readOnly);
+  if (db) return db;
+  db = new DatabaseSync(DB_PATH, { readOnly });
+  if (readOnly) {
+    tuneReadOnly(db);
+    conns.set(readOnly, db);
+    return db;
+  }
   db.exec(`
     PRAGMA journal_mode = WAL;   -- allow concurrent pullers
     PRAGMA busy_timeout = 60000; -- wait instead of "database is locked"
     PRAGMA synchronous = NORMAL; -- avoid fsync stalls on every commit (safe with WAL)
     PRAGMA wal_autocheckpoint = 2000; -- checkpoint in smaller slices so readers never stall long
+    PRAGMA mmap_size = 268435456; -- same read-side tuning as tuneReadOnly: the server reads through this handle too
+    PRAGMA cache_size = -65536;
+    PRAGMA temp_store = MEMORY;
   `);
   db.exec(`
     CREATE TABLE IF NOT EXISTS series (
@@ -25,7 +46,7 @@ function openDb() {
       value       REAL NOT NULL,   -- latest known value
       first_value REAL NOT NULL,   -- value as first published (for revision analysis)
       first_seen  TEXT NOT NULL,   -- when we first stored this point (publication-lag measurement)
-      last_seen   TEXT NOT NULL,
+      last_seen   TEXT NOT NULL,   -- when the stored value last changed (unchanged re-pulls are not rewritten)
       PRIMARY KEY (series, ts_utc)
     );
     CREATE INDEX IF NOT EXISTS idx_series_date ON series (series, date_ro, isp);
@@ -39,10 +60,23 @@ function openDb() {
       value     REAL,
       PRIMARY KEY (point, model, var, ts_utc, pulled_at)
     );
+    -- the PK starts with point, so time-range and per-var reads were full scans
+    CREATE INDEX IF NOT EXISTS ix_weather_ts ON weather (ts_utc);
+    CREATE INDEX IF NOT EXISTS ix_weather_var ON weather (var, ts_utc);
     CREATE TABLE IF NOT EXISTS pull_log (
       source TEXT, args TEXT, started TEXT, finished TEXT, rows INTEGER, error TEXT
     );
+    -- the locked (binding) prediction/bet per interval = last actionable run for that ts_utc, defined once.
+    -- Correlated MAX form so outer date_ro/ts_utc filters hit their index first and each interval's lookup is a
+    -- seek on (ts_utc, actionable, run_at), instead of GROUP BY over the whole table. Tables are created by predict.js.
+    CREATE VIEW IF NOT EXISTS pred_locked AS
+      SELECT p.* FROM predictions p WHERE p.actionable = 1
+        AND p.run_at = (SELECT MAX(q.run_at) FROM predictions q WHERE q.ts_utc = p.ts_utc AND q.actionable = 1);
+    CREATE VIEW IF NOT EXISTS bets_locked AS
+      SELECT b.* FROM bets b WHERE b.actionable = 1
+        AND b.run_at = (SELECT MAX(q.run_at) FROM bets q WHERE q.ts_utc = b.ts_utc AND q.actionable = 1);
   `);
+  conns.set(readOnly, db);
   return db;
 }
 
@@ -56,17 +90,25 @@ function roDate(d) {
 
 // Map a UTC instant to the Romanian delivery date and 15-min ISP index.
 // ISPs are numbered sequentially within the local day (1..96; 92 on spring DST, 100 on fall DST),
-// the same convention as ENTSO-E Point positions. Midnights are cached per date.
-const midnightCache = new Map();
+// the same convention as ENTSO-E Point positions. Each date's [midnight, next midnight) span is cached, and the
+// last one used is kept so instants inside it (callers mostly walk time in order) skip the tz formatter entirely;
+// a miss on a known date costs one roDate call.
+const dayCache = new Map();
+let lastDay = { date: null, mid: 0, end: 0 };
 function roDateIsp(d) {
+  const ms = d.getTime();
+  if (ms >= lastDay.mid && ms < lastDay.end) return { date: lastDay.date, isp: Math.floor((ms - lastDay.mid) / 900000) + 1 };
   const date = roDate(d);
-  let mid = midnightCache.get(date);
-  if (mid === undefined) {
-    let t = d.getTime() - (d.getTime() % 900000);
-    while (roDate(new Date(t - 900000)) === date) t -= 900000;
-    midnightCache.set(date, (mid = t));
+  let day = dayCache.get(date);
+  if (!day) {
+    let mid = ms - (ms % 900000);
+    while (roDate(new Date(mid - 900000)) === date) mid -= 900000;
+    let end = mid + 23 * 3600000; // shortest (spring DST) day; step to the first quarter of the next local date
+    while (roDate(new Date(end)) === date) end += 900000;
+    dayCache.set(date, (day = { date, mid, end }));
   }
-  return { date, isp: Math.floor((d.getTime() - mid) / 900000) + 1 };
+  lastDay = day;
+  return { date, isp: Math.floor((ms - day.mid) / 900000) + 1 };
 }
 
 function makeUpserter(db) {
@@ -76,6 +118,7 @@ function makeUpserter(db) {
     ON CONFLICT (series, ts_utc) DO UPDATE SET
       value = excluded.value,
       last_seen = excluded.last_seen
+    WHERE value IS NOT excluded.value -- update pulls re-send days of unchanged points; skip those page writes
   `);
   return (series, tsUtc, value) => {
     const now = new Date().toISOString();
@@ -84,4 +127,46 @@ function makeUpserter(db) {
   };
 }
 
-module.exports = { openDb, roDateIsp, makeUpserter, DB_PATH };
+// Column sets of every table ({table -> Set(column)}), read in one sqlite_master x pragma_table_info pass and
+// cached per connection keyed by PRAGMA schema_version, so repeated checks skip the metadata walk until DDL runs.
+const schemaCache = new WeakMap();
+function tableColumns(db) {
+  let c = schemaCache.get(db);
+  if (!c) schemaCache.set(db, (c = { ver: db.prepare('PRAGMA schema_version'), at: null, cols: null }));
+  const v = c.ver.get().schema_version;
+  if (c.at !== v) {
+    c.cols = new Map();
+    for (const r of db.prepare(`
+      SELECT m.name t, p.name c FROM sqlite_master m, pragma_table_info(m.name) p WHERE m.type = 'table'
+    `).all()) {
+      if (!c.cols.has(r.t)) c.cols.set(r.t, new Set());
+      c.cols.get(r.t).add(r.c);
+    }
+    c.at = v;
+  }
+  return c.cols;
+}
+
+// Add missing columns: { table: { column: 'TYPE [DEFAULT ...]' } }. Only the ALTERs actually needed run,
+// together in a single transaction (one schema change, not N).
+function addColumns(db, spec) {
+  const have = tableColumns(db);
+  const todo = [];
+  for (const [table, cols] of Object.entries(spec)) {
+    for (const [col, type] of Object.entries(cols)) {
+      if (!have.get(table)?.has(col)) todo.push(`ALTER TABLE ${table} ADD COLUMN ${col} ${type}`);
+    }
+  }
+  if (!todo.length) return 0;
+  db.exec('BEGIN');
+  try {
+    for (const sql of todo) db.exec(sql);
+    db.exec('COMMIT');
+  } catch (e) {
+    db.exec('ROLLBACK');
+    throw e;
+  }
+  return todo.length;
+}
+
+module.exports = { openDb, tuneReadOnly, roDateIsp, makeUpserter, addColumns, tableColumns, DB_PATH };
@@ -8,17 +8,20 @@ const BASE = 'https://web-api.tp.entsoe.eu/api';
 
 function getToken() {
   if (process.env.ENTSOE_TOKEN) return process.env.ENTSOE_TOKEN;
-  const cfgPath = path.join(__dirname, '..', 'config.json');
-  if (fs.existsSync(cfgPath)) {
-    const cfg = JSON.parse(fs.readFileSync(cfgPath, 'utf8').replace(/^﻿/, ''));
-    if (cfg.entsoe_token) return cfg.entsoe_token;
-  }
-  return null;
+  // read directly (no existsSync probe first): a missing file is just ENOENT, anything else still throws
+  let text;
+  try { text = fs.readFileSync(path.join(__dirname, '..', 'config.json'), 'utf8'); } catch (e) { if (e.code === 'ENOENT') return null; throw e; }
+  const cfg = JSON.parse(text.replace(/^﻿/, ''));
+  return cfg.entsoe_token || null;
 }
 
+// isArray runs for every element of every document — Set lookup, not a fresh array scan per node
+const ARRAY_TAGS = new Set(['TimeSeries', 'Period', 'Point', 'imbalance_Price']);
+// Every value parseDocument reads is element text; the attributes (codingScheme on each mRID, etc.) are never read,
+// so skipping them keeps those nodes plain strings instead of {#text, @_attr} objects — a much smaller tree per doc.
 const parser = new XMLParser({
-  ignoreAttributes: false,
-  isArray: (name) => ['TimeSeries', 'Period', 'Point', 'imbalance_Price'].includes(name),
+  ignoreAttributes: true,
+  isArray: (name) => ARRAY_TAGS.has(name),
 });
 
 function fmtPeriod(d) {
@@ -28,6 +31,16 @@ function fmtPeriod(d) {
 
 const sleep = (ms) => new Promise((r) => setTimeout(r, ms));
 
+// process-wide request pacer: every HTTP attempt (retries included) takes the next slot, MIN_GAP_MS apart, whatever
+// stream it comes from — at most 300 requests/min per process against the platform's 400/min per token
+const MIN_GAP_MS = 200;
+let nextSlot = 0;
+async function pace() {
+  const now = Date.now(), at = Math.max(now, nextSlot);
+  nextSlot = at + MIN_GAP_MS;
+  if (at > now) await sleep(at - now);
+}
+
 // Returns an array of XML document strings (some responses, e.g. A85/A86, arrive as ZIP archives),
 // or null for "no matching data".
 async function apiGet(params, token) {
@@ -36,6 +49,7 @@ async function apiGet(params, token) {
   url.searchParams.set('securityToken', token);
   for (const [k, v] of Object.entries(params)) url.searchParams.set(k, v);
   for (let attempt = 1; ; attempt++) {
+    await pace();
     const res = await fetch(url);
     const buf = Buffer.from(await res.arrayBuffer());
     if (res.ok) {
@@ -89,25 +103,26 @@ function parseDocument(xml) {
     const baseSuffix = parts.length ? '_' + parts.join('_') : '';
 
     for (const period of ts.Period || []) {
-      const start = new Date(period.timeInterval.start);
+      const startMs = Date.parse(period.timeInterval.start);
       const stepMin = resolutionMinutes(String(period.resolution));
       if (!stepMin) continue;
       const points = period.Point || [];
       const curveA03 = ts.curveType === 'A03';
       const lastPos = points.length ? Number(points[points.length - 1].position) : 0;
+      // one emitter per period (not a fresh closure + Date per point); t0 is the point's start in epoch ms
+      let t0 = 0;
+      const emit = (suffix, value) => {
+        if (value === undefined || value === null || value === '') return;
+        const v = Number(value);
+        for (let off = 0; off < stepMin; off += 15) rows.push({ suffix, ts: new Date(t0 + off * 60000), value: v });
+      };
       let pi = 0;
       let current = null;
       for (let pos = 1; pos <= lastPos; pos++) {
         if (pi < points.length && Number(points[pi].position) === pos) current = points[pi++];
         else if (!curveA03) continue; // gap only legal for A03 (value persists)
         if (!current) continue;
-        const t0 = new Date(start.getTime() + (pos - 1) * stepMin * 60000);
-        const emit = (suffix, value) => {
-          if (value === undefined || value === null || value === '') return;
-          for (let off = 0; off < stepMin; off += 15) {
-            rows.push({ suffix, ts: new Date(t0.getTime() + off * 60000), value: Number(value) });
-          }
-        };
+        t0 = startMs + (pos - 1) * stepMin * 60000;
         if (current['imbalance_Price'] || current['imbalance_Price.amount'] !== undefined) {
           const prices = current['imbalance_Price']
             ? current['imbalance_Price']
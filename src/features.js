@@ -28,12 +28,12 @@ function loadSeries(db, names, fromIso) {
 // merit-order summary per (date_ro, mtu): depth + cheap-end prices
 function loadStacks(db, fromDate) {
   const stacks = new Map(); // key date|mtu -> {upMw, downMw, upP25, downP75}
-  const rows = db.prepare(`
+  const stmt = db.prepare(`
     SELECT date_ro, mtu, direction, COUNT(*) n, SUM(pmax) mw,
            AVG(price) avg_price, MIN(price) min_price, MAX(price) max_price
     FROM offers WHERE date_ro >= ? GROUP BY date_ro, mtu, direction
-  `).all(fromDate);
-  for (const r of rows) {
+  `);
+  for (const r of stmt.iterate(fromDate)) {
     const key = r.date_ro + '|' + r.mtu;
     if (!stacks.has(key)) stacks.set(key, {});
     const s = stacks.get(key);
@@ -45,14 +45,14 @@ function loadStacks(db, fromDate) {
 
 // weather averaged across points per (var, hour ts) for the LATEST run <= asOf, plus cross-model std
 function loadWeather(db, fromIso) {
-  // rows: var, ts_utc, pulled_at, model -> avg over points
-  const rows = db.prepare(`
+  // rows: var, ts_utc, pulled_at, model -> avg over points; streamed, every stored run makes this the largest read
+  const stmt = db.prepare(`
     SELECT var, ts_utc, pulled_at, model, AVG(value) v
-    FROM weather WHERE ts_utc >= ? GROUP BY var, ts_utc, pulled_at, model
-  `).all(fromIso);
-  // index: var|ts -> sorted list of {pulled_at, perModel:{}}
+    FROM weather WHERE ts_utc >= ? GROUP BY var, ts_utc, pulled_at, model ORDER BY var, ts_utc, pulled_at, model
+  `);
+  // index: var|ts -> sorted list of {pulled_at, perModel:{}} (rows arrive pulled_at-ordered, so insertion order is sorted)
   const idx = new Map();
-  for (const r of rows) {
+  for (const r of stmt.iterate(fromIso)) {
     const key = r.var + '|' + r.ts_utc;
     if (!idx.has(key)) idx.set(key, new Map());
     const runs = idx.get(key);
@@ -61,7 +61,7 @@ function loadWeather(db, fromIso) {
   }
   const out = new Map();
   for (const [key, runs] of idx) {
-    out.set(key, [...runs.entries()].sort((a, b) => a[0].localeCompare(b[0])));
+    out.set(key, [...runs.entries()]);
   }
   return out;
 }
@@ -85,6 +85,11 @@ function weatherAt(weatherIdx, varName, ts, asOfIso) {
 
 const get = (map, ts) => { const v = map.get(ts); return v === undefined ? null : v; };
 const tsAt = (d) => d.toISOString().slice(0, 19) + '.000Z';
+// per-border series names built once: featuresFor runs for every training sample, so its border sums must not
+// rebuild 4 names per border per interval
+const XB_LEGS = ['HU', 'BG', 'RS', 'UA', 'MD'].map((cc) => ({
+  schedExp: 'sched_RO_' + cc, schedImp: 'sched_' + cc + '_RO', flowExp: 'flow_RO_' + cc, flowImp: 'flow_' + cc + '_RO',
+}));
 
 // mean of last n values of `series` whose interval END (+lag) <= asOf
 function recentMean(map, asOf, n, lagMin = DAMAS_LAG_MIN) {
@@ -150,9 +155,9 @@ function featuresFor(ctx, target, asOf) {
   // commitments: scheduled net export for the target interval (null until published)
   let netExport = null;
   let any = false;
-  for (const cc of ['HU', 'BG', 'RS', 'UA', 'MD']) {
-    const exp = get(m['sched_RO_' + cc], ts);
-    const imp = get(m['sched_' + cc + '_RO'], ts);
+  for (const l of XB_LEGS) {
+    const exp = get(m[l.schedExp], ts);
+    const imp = get(m[l.schedImp], ts);
     if (exp !== null || imp !== null) { any = true; netExport = (netExport ?? 0) + (exp ?? 0) - (imp ?? 0); }
   }
   if (!any) netExport = null;
@@ -189,9 +194,10 @@ function featuresFor(ctx, target, asOf) {
     const vals = [];
     for (let i = 0; i < 16 && vals.length < 4; i++) {
       let phys = null, sched = null;
-      for (const cc of ['HU', 'BG', 'RS', 'UA', 'MD']) {
-        const pe = get(m['flow_RO_' + cc], tsAt(t)), pi = get(m['flow_' + cc + '_RO'], tsAt(t));
-        const se = get(m['sched_RO_' + cc], tsAt(t)), si = get(m['sched_' + cc + '_RO'], tsAt(t));
+      const tt = tsAt(t); // once per interval, not 4× per border
+      for (const l of XB_LEGS) {
+        const pe = get(m[l.flowExp], tt), pi = get(m[l.flowImp], tt);
+        const se = get(m[l.schedExp], tt), si = get(m[l.schedImp], tt);
         if (pe !== null || pi !== null) phys = (phys ?? 0) + (pe ?? 0) - (pi ?? 0);
         if (se !== null || si !== null) sched = (sched ?? 0) + (se ?? 0) - (si ?? 0);
       }
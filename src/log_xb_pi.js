@@ -4,23 +4,54 @@
 // later test whether that belief-updating (the PI evolution) LEADS the realized imbalance.
 //   node tool/log_xb_pi.js     (schedule every ~10 min)
 const { openDb, roDateIsp } = require('./db');
+const { senGraficUrl, parseSenGrafic } = require('./sen_grafic');
 const BASE = 'https://newmarkets.transelectrica.ro/usy-durom-publicreportg01/00121002500000000000000000000100/';
 const num = (v) => { const n = Number(v); return v !== null && v !== undefined && v !== 'N/A' && Number.isFinite(n) ? n : null; };
 const EXPB = ['rohu', 'robg', 'rors', 'roua', 'romd'], IMPB = ['huro', 'bgro', 'rsro', 'uaro', 'mdro'];
 
 (async () => {
   const db = openDb();
-  db.exec('CREATE TABLE IF NOT EXISTS xb_pi_snap(pulled_at TEXT, ts_utc TEXT, date_ro TEXT, isp INTEGER, d1 REAL, pi REAL, lt REAL, commercial REAL)');
-  db.exec('CREATE INDEX IF NOT EXISTS ix_xbsnap ON xb_pi_snap(ts_utc, pulled_at)');
+  // all of this job's tables + indexes in ONE exec (this runs every minute) instead of eight separate round-trips
+  db.exec(`
+    CREATE TABLE IF NOT EXISTS xb_pi_snap(pulled_at TEXT, ts_utc TEXT, date_ro TEXT, isp INTEGER, d1 REAL, pi REAL, lt REAL, commercial REAL);
+    CREATE INDEX IF NOT EXISTS ix_xbsnap ON xb_pi_snap(ts_utc, pulled_at);
+    -- the server reads frames per (date_ro, isp) in pulled_at order (notif bal, PI moves, panics, ⓘ popups)
+    CREATE INDEX IF NOT EXISTS ix_xbsnap_di ON xb_pi_snap(date_ro, isp, pulled_at);
+    CREATE TABLE IF NOT EXISTS xb_delta_snap(pulled_at TEXT, ts_utc TEXT, date_ro TEXT, isp INTEGER, real_xb REAL, notif_xb REAL, delta REAL);
+    CREATE INDEX IF NOT EXISTS ix_xbdelta ON xb_delta_snap(ts_utc, pulled_at);
+    CREATE INDEX IF NOT EXISTS ix_xbdelta_day ON xb_delta_snap(date_ro, pulled_at); -- xbDeltaAgg per day
+    CREATE TABLE IF NOT EXISTS live_log(pulled_at TEXT, ts_utc TEXT, date_ro TEXT, isp INTEGER, series TEXT, value REAL);
+    CREATE INDEX IF NOT EXISTS ix_livelog ON live_log(series, ts_utc, pulled_at);
+  `);
   const todayUtc = new Date().toISOString().slice(0, 10);
   const from = new Date(todayUtc + 'T00:00:00Z').toISOString();
   const to = new Date(new Date(todayUtc + 'T00:00:00Z').getTime() + 2 * 86400000).toISOString(); // today + tomorrow
   const u = new URL(BASE + 'publicReport/scheduledExchanges');
   u.searchParams.set('timeInterval', JSON.stringify({ from, to }));
+  const eu = new URL(BASE + 'publicReport/estimatedImbalancePrices');
+  eu.searchParams.set('timeInterval', JSON.stringify({ from, to }));
+  const riNow = roDateIsp(new Date());
+  const su = senGraficUrl(riNow.date);
+  // the three feeds are independent: start them together (one round-trip of wall time instead of three) and
+  // await each where it is consumed. Empty catches only mark the later-awaited promises as handled.
+  const senP = fetch(su, { headers: { 'User-Agent': 'Mozilla/5.0', 'Accept': '*/*', 'X-Requested-With': 'XMLHttpRequest' } })
+    .then((r) => (r.ok ? r.text() : null));
+  const estP = fetch(eu).then((r) => r.json());
+  senP.catch(() => {}); estP.catch(() => {});
   const items = (await (await fetch(u)).json()).itemList || [];
   const pulledAt = new Date().toISOString();
   const nowMs = Date.now();
-  const netTf = (item, tf) => { let s = 0, any = false; for (const b of EXPB) { const o = item[b]; const v = o ? num(o[tf]) : null; if (v !== null) { s += v; any = true; } } for (const b of IMPB) { const o = item[b]; const v = o ? num(o[tf]) : null; if (v !== null) { s -= v; any = true; } } return any ? s : null; };
+  // net (export − import) for all four timeframes in ONE pass over the 10 border legs (each leg object read once,
+  // instead of re-walking every border per timeframe); a timeframe with no published leg stays null
+  const TFS = ['commercial', 'intraday', 'dayAhead', 'longTerm'];
+  const netAll = (item) => {
+    const out = { commercial: null, intraday: null, dayAhead: null, longTerm: null };
+    for (const [legs, sign] of [[EXPB, 1], [IMPB, -1]]) for (const b of legs) {
+      const o = item[b]; if (!o) continue;
+      for (const tf of TFS) { const v = num(o[tf]); if (v !== null) out[tf] = (out[tf] ?? 0) + sign * v; }
+    }
+    return out;
+  };
   const snap = db.prepare('INSERT INTO xb_pi_snap VALUES (?,?,?,?,?,?,?,?)');
   // DEDUP: only append a frame when the net position CHANGED since this interval's last frame, so we can poll
   // every 60s (catch the heavy last-5-min trading) while storing only real belief-moves — flat intervals cost 0.
@@ -31,39 +62,28 @@ const EXPB = ['rohu', 'robg', 'rors', 'roua', 'romd'], IMPB = ['huro', 'bgro', '
   for (const item of items) {
     const ts = item.timeInterval && item.timeInterval.from;
     if (!ts || new Date(ts).getTime() <= nowMs) continue; // only pre-delivery (upcoming) intervals
-    const cm = netTf(item, 'commercial');
+    const net = netAll(item);
+    const cm = net.commercial;
     if (cm === null) continue;
-    const pi = netTf(item, 'intraday');
+    const pi = net.intraday;
     const prev = lastMap.get(ts);
     if (prev && Math.abs(cm - prev.commercial) < 0.5 && Math.abs((pi ?? 0) - (prev.pi ?? 0)) < 0.5) continue; // unchanged → skip
     const ri = roDateIsp(new Date(ts));
-    snap.run(pulledAt, ts, ri.date, ri.isp, netTf(item, 'dayAhead'), pi, netTf(item, 'longTerm'), cm);
+    snap.run(pulledAt, ts, ri.date, ri.isp, net.dayAhead, pi, net.longTerm, cm);
     n++;
   }
   db.exec('COMMIT');
   console.log(`xb_pi_snap +${n} changed rows @ ${pulledAt}`);
 
   // --- SEN (real prod/cons/sold), fetched once and shared by the X-B Δ + live_log captures below ---
-  const sen = new Map(); // isp -> {prod, cons, sold} for today (RO); Real X-B = −sold
+  let sen = new Map(); // isp -> {prod, cons, sold} for today (RO); Real X-B = −sold
   try {
-    const riNow = roDateIsp(new Date());
-    const pre = '&_SENGrafic_WAR_SENGraficportlet_';
-    const [yy, mm, dd] = riNow.date.split('-');
-    const su = 'https://www.transelectrica.ro/widget/web/tel/sen-grafic?p_p_id=SENGrafic_WAR_SENGraficportlet&p_p_lifecycle=2&p_p_state=maximized&p_p_mode=view&p_p_cacheability=cacheLevelPage'
-      + pre + 'random=' + Date.now()
-      + pre + 'start_day=' + (+dd) + pre + 'start_month=' + (+mm) + pre + 'start_year=' + yy + pre + 'start_Hour=0' + pre + 'start_Minute=0'
-      + pre + 'end_day=' + (+dd) + pre + 'end_month=' + (+mm) + pre + 'end_year=' + yy + pre + 'end_Hour=23' + pre + 'end_Minute=59';
-    const sr = await fetch(su, { headers: { 'User-Agent': 'Mozilla/5.0', 'Accept': '*/*', 'X-Requested-With': 'XMLHttpRequest' } });
-    if (sr.ok) {
-      const tx = await sr.text();
-      for (const row of tx.split('|')) { const f = row.split(';'); if (f.length < 12) continue; const t = /(\d{2})-(\d{2})-(\d{4}) (\d{2}):(\d{2})/.exec(f[0].trim()); if (!t) continue; const isp = Math.floor((+t[4] * 60 + +t[5]) / 15) + 1; sen.set(isp, { prod: +f[3], cons: +f[1], sold: +f[4] }); }
-    }
+    const tx = await senP;
+    if (tx !== null) sen = parseSenGrafic(tx); // same decode as server.js liveSEN
   } catch (e) { console.error('SEN fetch failed:', e.message); }
 
   // --- X-B Δ trajectory (REALIZED side): Real X-B − Notif X-B for current + recently-delivered intervals,
   // so the UI shows an interval-AVERAGE + drift arrow (the SEN side keeps firming after the PI gate closes).
-  db.exec('CREATE TABLE IF NOT EXISTS xb_delta_snap(pulled_at TEXT, ts_utc TEXT, date_ro TEXT, isp INTEGER, real_xb REAL, notif_xb REAL, delta REAL)');
-  db.exec('CREATE INDEX IF NOT EXISTS ix_xbdelta ON xb_delta_snap(ts_utc, pulled_at)');
   try {
     if (sen.size) {
       const lastD = new Map();
@@ -75,7 +95,7 @@ const EXPB = ['rohu', 'robg', 'rors', 'roua', 'romd'], IMPB = ['huro', 'bgro', '
         const tms = new Date(ts).getTime();
         if (tms > nowMs || tms < nowMs - 3 * 3600000) continue; // current + last ~3h of delivered intervals
         const r2 = roDateIsp(new Date(ts)); const se = sen.get(r2.isp); const s = se ? se.sold : undefined; if (s === undefined || !Number.isFinite(s)) continue;
-        const notif = netTf(item, 'commercial'); if (notif === null) continue;
+        const notif = netAll(item).commercial; if (notif === null) continue;
         const real = -s, delta = real - notif;
         const prev = lastD.get(ts);
         if (prev !== undefined && Math.abs(delta - prev) < 1) continue; // unchanged → skip (dedup)
@@ -88,8 +108,6 @@ const EXPB = ['rohu', 'robg', 'rors', 'roua', 'romd'], IMPB = ['huro', 'bgro', '
 
   // --- FULL live-value trajectory: append EVERY changed value each 60s (no granularity lost between the 5-min
   // canonical pulls) for the fast-revising values — imbalance, est prices, balancing qty/value, SEN — into live_log.
-  db.exec('CREATE TABLE IF NOT EXISTS live_log(pulled_at TEXT, ts_utc TEXT, date_ro TEXT, isp INTEGER, series TEXT, value REAL)');
-  db.exec('CREATE INDEX IF NOT EXISTS ix_livelog ON live_log(series, ts_utc, pulled_at)');
   try {
     const winFrom = Date.parse(from); // start of today (UTC). NOTE: query the day-aligned window (from/to) — a narrow window returns sparse items missing the imbalance/ISP fields.
     const lastLL = new Map();
@@ -97,9 +115,7 @@ const EXPB = ['rohu', 'robg', 'rors', 'roua', 'romd'], IMPB = ['huro', 'bgro', '
     const ll = db.prepare('INSERT INTO live_log VALUES (?,?,?,?,?,?)');
     const append = (series, ts, ri, v) => { if (v === null || !Number.isFinite(v)) return 0; const k = series + '|' + ts; const prev = lastLL.get(k); if (prev !== undefined && Math.abs(v - prev) < 0.01) return 0; lastLL.set(k, v); ll.run(pulledAt, ts, ri.date, ri.isp, series, v); return 1; };
     const FIELD = { estimatedSystemImbalance: 'damas_est_sys_imbalance', estimatedPricePositiveImbalance: 'damas_est_price_pos', estimatedPriceNegativeImbalance: 'damas_est_price_neg', sumQup: 'damas_qup', sumQdn: 'damas_qdn', sumQupPup: 'damas_qup_value', sumQdownPdn: 'damas_qdn_value' };
-    const eu = new URL(BASE + 'publicReport/estimatedImbalancePrices');
-    eu.searchParams.set('timeInterval', JSON.stringify({ from, to }));
-    const eItems = (await (await fetch(eu)).json()).itemList || [];
+    const eItems = (await estP).itemList || [];
     let llN = 0; db.exec('BEGIN');
     for (const it of eItems) {
       const ts = it.timeInterval && it.timeInterval.from; if (!ts) continue;
@@ -113,13 +129,16 @@ const EXPB = ['rohu', 'robg', 'rors', 'roua', 'romd'], IMPB = ['huro', 'bgro', '
   } catch (e) { try { db.exec('ROLLBACK'); } catch {} console.error('live_log record failed:', e.message); }
 
   // --- sen-filter homepage SCADA snapshots (24/7 capture for prediction): poll ~5x at 10s within this run,
-  // recording each DISTINCT snapshot (deduped by SCADA timestamp) to sen_live. Decode/schema in sen_filter.js. ---
+  // recording each DISTINCT snapshot (deduped by SCADA timestamp) to sen_live. Decode/schema in sen_filter.js.
+  // A poll is skipped when another writer (the server's live UI) stored a new snapshot within the last 8s — under
+  // the 10s poll, so timer jitter can't make the check race it — and the shared sen_live table doubles as a TTL
+  // cache for this feed. This loop's own captures never cause a skip. ---
   try {
     const senFilter = require('./sen_filter');
     senFilter.ensureTable(db);
     let sn = 0;
     for (let i = 0; i < 5; i++) {
-      try { const d = await senFilter.fetchSenFilter(); if (d && senFilter.record(db, d, roDateIsp)) sn++; } catch { /* transient */ }
+      try { if (senFilter.capturedAgoMs(db) >= 8000) { const d = await senFilter.fetchSenFilter(); if (d && senFilter.record(db, d, roDateIsp)) sn++; } } catch { /* transient */ }
       if (i < 4) await new Promise((r) => setTimeout(r, 10000));
     }
     console.log(`sen_live +${sn} snapshots`);
@@ -16,27 +16,33 @@ try {
   db.exec(`CREATE TABLE IF NOT EXISTS pi_learn_log(ts_utc TEXT PRIMARY KEY, isp INTEGER, persist REAL, pi_move REAL, prob REAL, pred INTEGER, y INTEGER, ok_model INTEGER, ok_persist INTEGER, big INTEGER, learned_at TEXT)`);
   // log_xb_pi.js owns xb_pi_snap; create-if-absent here too so a fresh DB or job-order race (both jobs stagger 0-30s on boot) can't crash this learner — it just finds 0 rows.
   db.exec('CREATE TABLE IF NOT EXISTS xb_pi_snap(pulled_at TEXT, ts_utc TEXT, date_ro TEXT, isp INTEGER, d1 REAL, pi REAL, lt REAL, commercial REAL)');
+  db.exec('CREATE INDEX IF NOT EXISTS ix_xbsnap ON xb_pi_snap(ts_utc, pulled_at)');
   let st = db.prepare('SELECT * FROM pi_learn_state WHERE id=1').get();
   if (!st) { st = { w0: 0, w1: 0.4, w2: 0, n: 0, model_ok: 0, persist_ok: 0 }; db.prepare('INSERT INTO pi_learn_state VALUES (1,?,?,?,?,?,?,?)').run(0, 0.4, 0, 0, 0, 0, new Date().toISOString()); }
 
   // realized imbalance series
-  const imbRows = db.prepare("SELECT ts_utc, value FROM series WHERE series='damas_est_sys_imbalance'").all();
+  const imbRows = db.prepare("SELECT ts_utc, value FROM series WHERE series='damas_est_sys_imbalance' ORDER BY ts_utc").all(); // PK order, no JS sort
   const imb = new Map(imbRows.map((r) => [r.ts_utc, r.value]));
-  const imbTs = imbRows.map((r) => r.ts_utc).sort();
+  // time-ordered columns (ms, value) as typed arrays: lastKnownImb binary-searches them instead of walking the whole
+  // history from the start for every candidate interval
+  const N = imbRows.length, imbMs = new Float64Array(N), imbVal = new Float64Array(N);
+  for (let i = 0; i < N; i++) { imbMs[i] = Date.parse(imbRows[i].ts_utc); imbVal[i] = imbRows[i].value; }
   const lastKnownImb = (atMs) => { // last imbalance with ts_utc end <= at - lag (publication realism)
-    const cutoff = new Date(atMs - IMB_LAG_MIN * 60000).toISOString();
-    let v = null; for (const t of imbTs) { if (t <= cutoff) v = imb.get(t); else break; } return v;
+    const cutoff = atMs - IMB_LAG_MIN * 60000;
+    let lo = 0, hi = N - 1, r = -1; while (lo <= hi) { const m = (lo + hi) >> 1; if (imbMs[m] <= cutoff) { r = m; lo = m + 1; } else hi = m - 1; }
+    return r < 0 ? null : imbVal[r];
   };
-  // PI snapshots grouped per delivery interval
-  const snaps = db.prepare('SELECT ts_utc, isp, commercial, pulled_at FROM xb_pi_snap ORDER BY pulled_at').all();
+  // PI snapshots of not-yet-learned intervals, grouped per delivery interval (streamed: xb_pi_snap gains a row per
+  // interval per minute). Read in (ts_utc, pulled_at) index order — no full-table sort on pulled_at — and the
+  // anti-join skips every already-learned interval instead of loading all history to filter it in JS.
   const byTs = new Map();
-  for (const s of snaps) { if (!byTs.has(s.ts_utc)) byTs.set(s.ts_utc, []); byTs.get(s.ts_utc).push(s); }
-  const done = new Set(db.prepare('SELECT ts_utc FROM pi_learn_log').all().map((r) => r.ts_utc));
+  for (const s of db.prepare(`SELECT ts_utc, isp, commercial, pulled_at FROM xb_pi_snap
+    WHERE ts_utc NOT IN (SELECT ts_utc FROM pi_learn_log) ORDER BY ts_utc, pulled_at`).iterate()) { if (!byTs.has(s.ts_utc)) byTs.set(s.ts_utc, []); byTs.get(s.ts_utc).push(s); }
 
   const ins = db.prepare('INSERT OR IGNORE INTO pi_learn_log VALUES (?,?,?,?,?,?,?,?,?,?,?)');
   let learned = 0;
   // learnable = settled intervals (realized present) that have pre-A snapshots and weren't learned yet
-  const candidates = [...byTs.keys()].filter((ts) => imb.has(ts) && !done.has(ts)).sort();
+  const candidates = [...byTs.keys()].filter((ts) => imb.has(ts)); // already in ts order
   // one transaction: keeps the logged samples and the SGD weight state in lockstep (no half-applied learning if it dies mid-loop)
   db.exec('BEGIN');
   for (const ts of candidates) {
@@ -10,7 +10,7 @@
 // replace it, they only appear as "live view".
 const fs = require('fs');
 const path = require('path');
-const { openDb, roDateIsp } = require('./db');
+const { openDb, roDateIsp, addColumns } = require('./db');
 const { buildContext, featuresFor, FEATURE_NAMES, MIN } = require('./features');
 
 const FREEZE_MIN = 75;
@@ -32,7 +32,6 @@ function ensureTables(db) {
     );
     CREATE INDEX IF NOT EXISTS idx_pred_target ON predictions (ts_utc, actionable, run_at);
   `);
-  try { db.exec('ALTER TABLE predictions ADD COLUMN imb_p50 REAL'); } catch { /* exists */ }
   db.exec(`
     CREATE TABLE IF NOT EXISTS bets (
       run_at TEXT NOT NULL,
@@ -52,16 +51,22 @@ function ensureTables(db) {
       realized_price REAL, realized_revenue REAL,
       PRIMARY KEY (run_at, ts_utc)
     );
+    CREATE INDEX IF NOT EXISTS idx_bets_target ON bets (ts_utc, actionable, run_at);
   `);
-  try { db.exec('ALTER TABLE bets ADD COLUMN tail_loss REAL'); } catch { /* exists */ }
-  try { db.exec('ALTER TABLE bets ADD COLUMN reason TEXT'); } catch { /* exists */ }
   db.exec(`CREATE TABLE IF NOT EXISTS user_bets (
     date_ro TEXT NOT NULL, isp INTEGER NOT NULL, qty REAL NOT NULL, updated_at TEXT NOT NULL,
     PRIMARY KEY (date_ro, isp))`);
-  try { db.exec(`ALTER TABLE user_bets ADD COLUMN source TEXT DEFAULT 'manual'`); } catch { /* exists */ }
+  addColumns(db, {
+    predictions: { imb_p50: 'REAL' },
+    bets: { tail_loss: 'REAL', reason: 'TEXT' },
+    user_bets: { source: "TEXT DEFAULT 'manual'" },
+  });
 }
 
+// parsed once per run: predict.js is a short-lived job, and computeBets + betsSection both read it
+let configCache = null;
 function loadConfig() {
+  if (configCache) return configCache;
   const defaults = {
     eur_ron: 5.24, trade_window_cet: [7, 22],
     max_mwh_per_isp: 2.5,
@@ -69,8 +74,9 @@ function loadConfig() {
     risk_aversion: 0.5,    // λ: still used to pick base vs max size
   };
   try {
-    return { ...defaults, ...JSON.parse(fs.readFileSync(path.join(__dirname, '..', 'config.json'), 'utf8').replace(/^﻿/, '')) };
-  } catch { return defaults; }
+    configCache = { ...defaults, ...JSON.parse(fs.readFileSync(path.join(__dirname, '..', 'config.json'), 'utf8').replace(/^﻿/, '')) };
+  } catch { configCache = defaults; }
+  return configCache;
 }
 
 function predictOne(model, bucket, values) {
@@ -119,11 +125,10 @@ function betsSection(db, today, tomorrow) {
   const lastRun = db.prepare(`SELECT MAX(run_at) m FROM bets`).get().m;
   if (!lastRun) return '';
   const bets = db.prepare(`SELECT * FROM bets WHERE run_at=? ORDER BY ts_utc`).all(lastRun);
+  // only the two rendered days and the columns the "Locked position"/"Realized" cells show (was every locked bet ever)
   const lockedBets = new Map(db.prepare(`
-    SELECT b.* FROM bets b
-    JOIN (SELECT ts_utc, MAX(run_at) mr FROM bets WHERE actionable=1 GROUP BY ts_utc) x
-      ON x.ts_utc=b.ts_utc AND x.mr=b.run_at
-  `).all().map((r) => [r.ts_utc, r]));
+    SELECT ts_utc, dir, qty, run_at, realized_revenue FROM bets_locked WHERE date_ro IN (?, ?)
+  `).all(today, tomorrow).map((r) => [r.ts_utc, r]));
 
   const renderDay = (date, label) => {
     const rows = bets.filter((b) => b.date_ro === date);
@@ -341,10 +346,7 @@ function renderDashboard(db, model, now) {
 
   // locked prediction per ISP = last actionable row; live = last row of latest run
   const locked = db.prepare(`
-    SELECT p.* FROM predictions p
-    JOIN (SELECT ts_utc, MAX(run_at) mr FROM predictions WHERE actionable=1 GROUP BY ts_utc) x
-      ON x.ts_utc = p.ts_utc AND x.mr = p.run_at
-    WHERE p.date_ro IN (?, ?) ORDER BY p.ts_utc
+    SELECT * FROM pred_locked WHERE date_ro IN (?, ?) ORDER BY ts_utc
   `).all(today, tomorrow);
   const lockedBy = new Map(locked.map((r) => [r.ts_utc, r]));
 
@@ -368,10 +370,8 @@ function renderDashboard(db, model, now) {
       AVG(CASE WHEN (prob_long>0.65 OR prob_long<0.35) AND (prob_long>0.5)=(realized_imb>0) THEN 1.0
                WHEN (prob_long>0.65 OR prob_long<0.35) THEN 0 ELSE NULL END) conf_acc,
       AVG(ABS(price_p50 - realized_price)) price_mae
-    FROM predictions p
-    JOIN (SELECT ts_utc, MAX(run_at) mr FROM predictions WHERE actionable=1 GROUP BY ts_utc) x
-      ON x.ts_utc=p.ts_utc AND x.mr=p.run_at
-    WHERE realized_imb IS NOT NULL AND p.ts_utc >= ?
+    FROM pred_locked
+    WHERE realized_imb IS NOT NULL AND ts_utc >= ?
   `).get(new Date(now.getTime() - 7 * 86400000).toISOString());
 
   const fmtP = (v) => (v === null || v === undefined ? '—' : Math.round(v));
@@ -56,10 +56,22 @@ const REPORTS = [
 
 const sleep = (ms) => new Promise((r) => setTimeout(r, ms));
 
+// concurrent report streams, all drawing on one request pacer: every HTTP attempt (retries included) waits for the
+// next slot, MIN_GAP_MS apart, so the total request rate stays at the old one-stream pace however many streams run
+const STREAMS = 2;
+const MIN_GAP_MS = 350;
+let nextSlot = 0;
+async function pace() {
+  const now = Date.now(), at = Math.max(now, nextSlot);
+  nextSlot = at + MIN_GAP_MS;
+  if (at > now) await sleep(at - now);
+}
+
 async function fetchInterval(cmd, fromIso, toIso) {
   const url = new URL(BASE + 'publicReport/' + cmd);
   url.searchParams.set('timeInterval', JSON.stringify({ from: fromIso, to: toIso }));
   for (let attempt = 1; ; attempt++) {
+    await pace();
     const r = await fetch(url);
     if (r.ok) return (await r.json()).itemList || [];
     if (attempt < 4 && (r.status === 429 || r.status >= 500)) { await sleep(attempt * 3000); continue; }
@@ -71,9 +83,11 @@ const num = (v) => { const n = Number(v); return v !== null && v !== undefined &
 
 async function pull(db, from, to) {
   const upsert = makeUpserter(db);
-  const counts = {};
   const CHUNK = 7 * 86400000;
-  for (const rep of REPORTS) {
+  // reports are independent endpoints: pull them on STREAMS concurrent streams (chunks sequential within a report,
+  // requests paced by fetchInterval). Each chunk's BEGIN..COMMIT has no await inside, so the streams never
+  // interleave a transaction, and a failed chunk rolls back so the shared connection is never left mid-transaction.
+  const pullReport = async (rep) => {
     let total = 0;
     for (let t = from.getTime(); t < to.getTime(); t += CHUNK) {
       const tEnd = Math.min(to.getTime(), t + CHUNK);
@@ -81,33 +95,37 @@ async function pull(db, from, to) {
       try { items = await fetchInterval(rep.cmd, new Date(t).toISOString(), new Date(tEnd).toISOString()); }
       catch (e) { console.warn(`  ${rep.cmd}: ${e.message}`); continue; }
       db.exec('BEGIN');
-      for (const item of items) {
-        const ts = item.timeInterval.from;
-        if (rep.borders) {
-          // scheduledExchanges per direction: use the 'commercial' rollup (= dayAhead + intraday).
-          // NOT sum-of-all-leaves — that double-counts commercial with its own DA/ID components.
-          for (const b of rep.borders) {
-            const o = item[b];
-            if (o && typeof o === 'object') {
-              let v = num(o.commercial);
-              if (v === null) { const da = num(o.dayAhead), id = num(o.intraday); if (da !== null || id !== null) v = (da ?? 0) + (id ?? 0); }
-              if (v !== null) { upsert('damas_sx_' + b, ts, v); total++; }
+      try {
+        for (const item of items) {
+          const ts = item.timeInterval.from;
+          if (rep.borders) {
+            // scheduledExchanges per direction: use the 'commercial' rollup (= dayAhead + intraday).
+            // NOT sum-of-all-leaves — that double-counts commercial with its own DA/ID components.
+            for (const b of rep.borders) {
+              const o = item[b];
+              if (o && typeof o === 'object') {
+                let v = num(o.commercial);
+                if (v === null) { const da = num(o.dayAhead), id = num(o.intraday); if (da !== null || id !== null) v = (da ?? 0) + (id ?? 0); }
+                if (v !== null) { upsert('damas_sx_' + b, ts, v); total++; }
+              }
             }
+            continue;
+          }
+          for (const [field, series] of Object.entries(rep.fields)) {
+            const v = num(item[field]);
+            if (v !== null) { upsert(series, ts, v); total++; }
           }
-          continue;
-        }
-        for (const [field, series] of Object.entries(rep.fields)) {
-          const v = num(item[field]);
-          if (v !== null) { upsert(series, ts, v); total++; }
         }
-      }
-      db.exec('COMMIT');
-      await sleep(350);
+        db.exec('COMMIT');
+      } catch (e) { db.exec('ROLLBACK'); throw e; }
     }
-    counts[rep.cmd] = total;
     console.log(`  ${rep.cmd}: ${total} points`);
-  }
-  return Object.values(counts).reduce((a, b) => a + b, 0);
+    return total;
+  };
+  let next = 0, total = 0;
+  const stream = async () => { while (next < REPORTS.length) { const n = await pullReport(REPORTS[next++]); total += n; } };
+  await Promise.all(Array.from({ length: STREAMS }, stream));
+  return total;
 }
 
 async function main() {
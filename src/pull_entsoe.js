@@ -6,7 +6,7 @@
 //
 // Token: tool\config.json {"entsoe_token":"..."} or ENTSOE_TOKEN env var.
 const { openDb, makeUpserter } = require('./db');
-const { getToken, apiGet, parseDocument, fmtPeriod, sleep } = require('./entsoe');
+const { getToken, apiGet, parseDocument, fmtPeriod } = require('./entsoe');
 
 const RO = '10YRO-TEL------P';
 const NEIGHBOURS = {
@@ -17,6 +17,9 @@ const NEIGHBOURS = {
   MD: '10Y1001A1001A990',
 };
 
+// concurrent series pulls — request rate is capped by apiGet's shared pacer (300/min), not by the stream count
+const STREAMS = 3;
+
 const CATALOG = [
   // target side
   { name: 'imb_price',    params: { documentType: 'A85', controlArea_Domain: RO }, chunkDays: 30 },
@@ -44,39 +47,39 @@ for (const [cc, eic] of Object.entries(NEIGHBOURS)) {
   );
 }
 
-async function pullSeries(db, token, entry, from, to) {
-  const upsert = makeUpserter(db);
-  let total = 0;
+// one transaction per chunk (a late failure keeps every chunk already written, and only one chunk's rows are ever in
+// memory); the pull_log row rides in the last chunk's transaction instead of its own autocommit
+async function pullSeries(db, w, token, entry, from, to, logArgs) {
+  let n = 0;
   for (let t = new Date(from); t < to; ) {
     const tEnd = new Date(Math.min(to.getTime(), t.getTime() + entry.chunkDays * 86400000));
+    let rows = [];
     try {
       const docs = await apiGet(
         { ...entry.params, periodStart: fmtPeriod(t), periodEnd: fmtPeriod(tEnd) },
         token,
       );
-      if (docs) {
-        db.exec('BEGIN');
-        for (const xml of docs) {
-          const rows = parseDocument(xml);
-          for (const r of rows) upsert(entry.name + r.suffix, r.ts.toISOString(), r.value);
-          total += rows.length;
-        }
-        db.exec('COMMIT');
-      }
+      if (docs) rows = docs.flatMap(parseDocument);
     } catch (e) {
       if (!entry.optional) throw e;
       console.warn(`  [${entry.name}] skipped chunk (${e.message.slice(0, 120)})`);
     }
+    n += rows.length;
+    db.exec('BEGIN');
+    try {
+      for (const r of rows) w.upsert(entry.name + r.suffix, r.ts.toISOString(), r.value);
+      if (tEnd >= to) w.log.run('entsoe:' + entry.name, ...logArgs, new Date().toISOString(), n, null);
+      db.exec('COMMIT');
+    } catch (e) { db.exec('ROLLBACK'); throw e; }
     t = tEnd;
-    await sleep(350); // stay far below the rate limit
   }
-  return total;
+  return n;
 }
 
 async function main() {
   const [mode, a1, a2, a3] = process.argv.slice(2);
   if (mode === 'list') {
-    for (const e of CATALOG) console.log(`${e.name.padEnd(14)} ${JSON.stringify(e.params)}`);
+    process.stdout.write(CATALOG.map((e) => `${e.name.padEnd(14)} ${JSON.stringify(e.params)}`).join('\n') + '\n');
     return;
   }
   const token = getToken();
@@ -102,20 +105,25 @@ async function main() {
     process.exit(1);
   }
   const started = new Date().toISOString();
-  for (const entry of CATALOG) {
-    if (only && entry.name !== only) continue;
-    process.stdout.write(`${entry.name} ... `);
-    try {
-      const n = await pullSeries(db, token, entry, from, to);
-      console.log(`${n} points`);
-      db.prepare('INSERT INTO pull_log VALUES (?,?,?,?,?,?)')
-        .run('entsoe:' + entry.name, `${mode} ${from.toISOString()}..${to.toISOString()}`, started, new Date().toISOString(), n, null);
-    } catch (e) {
-      console.log('FAILED: ' + e.message.slice(0, 200));
-      db.prepare('INSERT INTO pull_log VALUES (?,?,?,?,?,?)')
-        .run('entsoe:' + entry.name, mode, started, new Date().toISOString(), 0, e.message.slice(0, 500));
+  const w = { upsert: makeUpserter(db), log: db.prepare('INSERT INTO pull_log VALUES (?,?,?,?,?,?)') }; // prepared once per run
+  // series are independent documents: pull them on a few concurrent streams (wall time ~ the slowest stream, not
+  // the sum of ~30 round-trips). All streams share apiGet's request pacer, and pullSeries' transactions have no
+  // await inside, so the streams never interleave a write. Lines print whole, once a series is done.
+  const entries = CATALOG.filter((e) => !only || e.name === only);
+  let next = 0;
+  const stream = async () => {
+    while (next < entries.length) {
+      const entry = entries[next++];
+      try {
+        const n = await pullSeries(db, w, token, entry, from, to, [`${mode} ${from.toISOString()}..${to.toISOString()}`, started]);
+        console.log(`${entry.name} ... ${n} points`);
+      } catch (e) {
+        console.log(`${entry.name} ... FAILED: ` + e.message.slice(0, 200));
+        w.log.run('entsoe:' + entry.name, mode, started, new Date().toISOString(), 0, e.message.slice(0, 500));
+      }
     }
-  }
+  };
+  await Promise.all(Array.from({ length: STREAMS }, stream));
 }
 
 main().catch((e) => { console.error(e); process.exit(1); });
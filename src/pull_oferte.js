@@ -84,30 +84,40 @@ function main() {
     CREATE INDEX IF NOT EXISTS idx_offers_lookup ON offers (date_ro, mtu, product, direction);
   `);
   const ins = db.prepare(`INSERT OR REPLACE INTO offers VALUES (?,?,?,?,?,?,?,?,?,?,?)`);
+  const del = db.prepare('DELETE FROM offers WHERE date_ro = ?');
 
   const val = (cell) => (cell ? (cell.s ? SS[Number(cell.v)] : cell.v) : null);
   const num = (cell) => { const n = Number(cell?.v); return Number.isFinite(n) ? n : null; };
 
+  // per-sheet progress lines are batched: one stdout write per ~30 day sheets instead of one per sheet
+  let out = [];
+  const flush = () => { if (out.length) process.stdout.write(out.join('\n') + '\n'); out = []; };
   let grand = 0;
   for (const sheet of sheets) {
     const xml = zip.readAsText(sheet.path);
     let n = 0;
-    db.exec('BEGIN');
-    db.prepare('DELETE FROM offers WHERE date_ro = ?').run(sheet.name);
-    for (const cells of rows(xml)) {
-      const mtu = num(cells.C);
-      const bidId = val(cells.G);
-      if (!mtu || !bidId) continue;
-      ins.run(
-        sheet.name, mtu, bidId, val(cells.D), val(cells.E), val(cells.F),
-        val(cells.M), num(cells.N), num(cells.O), num(cells.P), val(cells.R),
-      );
-      n++;
-    }
-    db.exec('COMMIT');
+    // IMMEDIATE: take the write lock up front so the day's delete+reload never fails half-way on a lock upgrade
+    // against a concurrent puller; a failed sheet rolls back instead of leaving the day empty
+    db.exec('BEGIN IMMEDIATE');
+    try {
+      del.run(sheet.name);
+      for (const cells of rows(xml)) {
+        const mtu = num(cells.C);
+        const bidId = val(cells.G);
+        if (!mtu || !bidId) continue;
+        ins.run(
+          sheet.name, mtu, bidId, val(cells.D), val(cells.E), val(cells.F),
+          val(cells.M), num(cells.N), num(cells.O), num(cells.P), val(cells.R),
+        );
+        n++;
+      }
+      db.exec('COMMIT');
+    } catch (e) { db.exec('ROLLBACK'); flush(); throw e; }
     grand += n;
-    console.log(`${sheet.name}: ${n} offers`);
+    out.push(`${sheet.name}: ${n} offers`);
+    if (out.length >= 30) flush();
   }
+  flush();
   db.prepare('INSERT INTO pull_log VALUES (?,?,?,?,?,?)')
     .run('oferte', file, new Date().toISOString(), new Date().toISOString(), grand, null);
   console.log(`total: ${grand} offer rows`);
@@ -98,11 +98,15 @@ async function main() {
     process.exit(1);
   }
 
+  // update's two days are independent POSTs on one session: start both at once (one round-trip of wall time).
+  // Backfill stays sequential with the 700 ms spacing so a long range doesn't hammer OPCOM.
+  const pending = mode === 'update' ? new Map(dates.map((d) => [d, fetchDay(session, d)])) : null;
+  if (pending) for (const p of pending.values()) p.catch(() => {}); // failures surface where each day is awaited
   const upsert = makeUpserter(db);
   let total = 0;
   for (const day of dates) {
     try {
-      const prices = await fetchDay(session, day);
+      const prices = await (pending ? pending.get(day) : fetchDay(session, day));
       db.exec('BEGIN');
       for (const [i, ron] of prices) {
         upsert('pzu_ron', tsForOpcomInterval(day, i), ron);
@@ -113,7 +117,7 @@ async function main() {
     } catch (e) {
       console.warn(`${day}: FAILED ${e.message.slice(0, 120)}`);
     }
-    await sleep(700);
+    if (!pending) await sleep(700);
   }
   db.prepare('INSERT INTO pull_log VALUES (?,?,?,?,?,?)')
     .run('opcom:pzu_ron', `${mode} ${dates[0]}..${dates[dates.length - 1]}`, new Date().toISOString(), new Date().toISOString(), total, null);
@@ -25,16 +25,20 @@ function fetchPage() {
 
 function parse(html) {
   const out = [];
+  // the sig_<key> select blocks and q_<key> input values, indexed in ONE pass each (first occurrence wins) — was a
+  // fresh RegExp per slot scanning the page from the top, i.e. quadratic in the number of slots
+  const selBy = new Map(), qBy = new Map();
+  for (const b of html.matchAll(/name="sig_([^"]+)"[\s\S]*?<\/select>/g)) if (!selBy.has(b[1])) selBy.set(b[1], b[0]);
+  for (const b of html.matchAll(/name="q_([^"]+)"[^>]*\svalue="([-0-9.]+)"/g)) if (!qBy.has(b[1])) qBy.set(b[1], +b[2]);
   // one entry per hidden slot_<key> = UTC ISO timestamp
   const slotRe = /name="slot_([^"]+)"\s+value="([^"]+)"/g; let m;
   while ((m = slotRe.exec(html))) {
     const key = m[1], ts = m[2];
     // selected option in the matching sig_<key> select
-    const selBlk = new RegExp(`name="sig_${key}"[\\s\\S]*?</select>`).exec(html);
-    let sig = null; if (selBlk) { const s = /<option value="([A-Z]+)"\s+selected/.exec(selBlk[0]); sig = s ? s[1] : (/<option value="([A-Z]+)"/.exec(selBlk[0]) || [])[1] || null; }
+    const selBlk = selBy.get(key);
+    let sig = null; if (selBlk) { const s = /<option value="([A-Z]+)"\s+selected/.exec(selBlk); sig = s ? s[1] : (/<option value="([A-Z]+)"/.exec(selBlk) || [])[1] || null; }
     // q_<key> number input value
-    const qm = new RegExp(`name="q_${key}"[^>]*\\svalue="([-0-9.]+)"`).exec(html);
-    const q = qm ? +qm[1] : null;
+    const q = qBy.has(key) ? qBy.get(key) : null;
     const d = new Date(ts); if (isNaN(d)) continue;
     const { date, isp } = roDateIsp(d);
     out.push({ ts, date, isp, sig, q });
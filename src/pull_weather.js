@@ -16,24 +16,38 @@ const POINTS = {
 };
 const MODELS = ['ecmwf_ifs025', 'icon_seamless', 'gfs_seamless'];
 const VARS = ['wind_speed_100m', 'wind_direction_100m', 'temperature_2m', 'shortwave_radiation', 'cloud_cover', 'precipitation'];
+const sleep = (ms) => new Promise((r) => setTimeout(r, ms));
+
+async function fetchPoint(name, { lat, lon }) {
+  const url = new URL('https://api.open-meteo.com/v1/forecast');
+  url.searchParams.set('latitude', lat);
+  url.searchParams.set('longitude', lon);
+  url.searchParams.set('hourly', VARS.join(','));
+  url.searchParams.set('models', MODELS.join(','));
+  url.searchParams.set('past_days', '1');
+  url.searchParams.set('forecast_days', '3');
+  url.searchParams.set('timezone', 'UTC');
+  // transient 429/5xx retried with a growing pause (as pull_damas does) rather than failing the whole hourly run
+  for (let attempt = 1; ; attempt++) {
+    const res = await fetch(url);
+    if (res.ok) return res.json();
+    if (attempt < 3 && (res.status === 429 || res.status >= 500)) { await res.arrayBuffer(); /* drain → socket back to the pool */ await sleep(attempt * 3000); continue; }
+    throw new Error(`Open-Meteo ${res.status} for ${name}: ${(await res.text()).slice(0, 200)}`);
+  }
+}
 
 async function main() {
   const db = openDb();
   const stmt = db.prepare('INSERT OR IGNORE INTO weather (point, model, var, ts_utc, pulled_at, value) VALUES (?,?,?,?,?,?)');
   const pulledAt = new Date().toISOString().slice(0, 16) + 'Z';
   let total = 0;
-  for (const [name, { lat, lon }] of Object.entries(POINTS)) {
-    const url = new URL('https://api.open-meteo.com/v1/forecast');
-    url.searchParams.set('latitude', lat);
-    url.searchParams.set('longitude', lon);
-    url.searchParams.set('hourly', VARS.join(','));
-    url.searchParams.set('models', MODELS.join(','));
-    url.searchParams.set('past_days', '1');
-    url.searchParams.set('forecast_days', '3');
-    url.searchParams.set('timezone', 'UTC');
-    const res = await fetch(url);
-    if (!res.ok) throw new Error(`Open-Meteo ${res.status} for ${name}: ${(await res.text()).slice(0, 200)}`);
-    const data = await res.json();
+  // the per-point requests are independent: start them all together (wall time ≈ the slowest, not the sum) and
+  // write each in POINTS order as before. The empty catch only marks the later-awaited promises as handled.
+  const pending = Object.entries(POINTS).map(([name, pt]) => {
+    const p = fetchPoint(name, pt); p.catch(() => {}); return [name, p];
+  });
+  for (const [name, dataP] of pending) {
+    const data = await dataP;
     const hourly = data.hourly;
     const times = hourly.time; // ISO, UTC
     db.exec('BEGIN');
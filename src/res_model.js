@@ -6,17 +6,21 @@
 function hourlyWeather(db, varName) {
   const m = new Map();
   // fast path: pre-materialized latest-run ensemble mean (pull_weather.js maintains weather_hourly)
-  try { for (const r of db.prepare('SELECT ts_utc, value FROM weather_hourly WHERE var=? AND value IS NOT NULL').all(varName)) m.set(r.ts_utc.slice(0, 13), r.value); } catch { /* table may not exist yet */ }
+  try { for (const r of db.prepare('SELECT ts_utc, value FROM weather_hourly WHERE var=? AND value IS NOT NULL').iterate(varName)) m.set(r.ts_utc.slice(0, 13), r.value); } catch { /* table may not exist yet */ }
   if (m.size) return m;
-  // fallback: derive latest-run mean from raw weather (only if weather_hourly is empty/absent)
-  const rows = db.prepare('SELECT ts_utc, pulled_at, value FROM weather WHERE var=? AND value IS NOT NULL').all(varName);
-  const latest = new Map(); for (const r of rows) { const e = latest.get(r.ts_utc); if (!e || r.pulled_at > e) latest.set(r.ts_utc, r.pulled_at); }
-  const agg = new Map(); for (const r of rows) { if (r.pulled_at !== latest.get(r.ts_utc)) continue; const h = r.ts_utc.slice(0, 13); const e = agg.get(h) || { s: 0, n: 0 }; e.s += r.value; e.n++; agg.set(h, e); }
+  // fallback: derive latest-run mean from raw weather (only if weather_hourly is empty/absent). Streamed in one pass —
+  // each ts keeps a running sum for its newest pulled_at (a newer run resets it) — instead of materializing every row.
+  const latest = new Map();
+  for (const r of db.prepare('SELECT ts_utc, pulled_at, value FROM weather WHERE var=? AND value IS NOT NULL').iterate(varName)) {
+    const e = latest.get(r.ts_utc);
+    if (!e || r.pulled_at > e.p) latest.set(r.ts_utc, { p: r.pulled_at, s: r.value, n: 1 });
+    else if (r.pulled_at === e.p) { e.s += r.value; e.n++; }
+  }
+  const agg = new Map(); for (const [ts, l] of latest) { const h = ts.slice(0, 13); const e = agg.get(h) || { s: 0, n: 0 }; e.s += l.s; e.n += l.n; agg.set(h, e); }
   for (const [h, e] of agg) m.set(h, e.s / e.n); return m;
 }
 function hourlyGen(db, series) {
-  const rows = db.prepare('SELECT ts_utc, value FROM series WHERE series=? AND value IS NOT NULL').all(series);
-  const m = new Map(); for (const r of rows) { const h = r.ts_utc.slice(0, 13); const e = m.get(h) || { s: 0, n: 0 }; e.s += r.value; e.n++; m.set(h, e); }
+  const m = new Map(); for (const r of db.prepare('SELECT ts_utc, value FROM series WHERE series=? AND value IS NOT NULL').iterate(series)) { const h = r.ts_utc.slice(0, 13); const e = m.get(h) || { s: 0, n: 0 }; e.s += r.value; e.n++; m.set(h, e); }
   const o = new Map(); for (const [h, e] of m) o.set(h, e.s / e.n); return o;
 }
 function lsqFit(X, Y) { const d = X[0].length; const A = Array.from({ length: d }, () => new Array(d).fill(0)); const b = new Array(d).fill(0); for (let r = 0; r < X.length; r++) for (let i = 0; i < d; i++) { b[i] += X[r][i] * Y[r]; for (let j = 0; j < d; j++) A[i][j] += X[r][i] * X[r][j]; } return solve(A, b); }
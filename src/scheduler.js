@@ -38,12 +38,29 @@ function runJob(job) {
     [...(job.nodeArgs || []), path.join(__dirname, job.script), ...job.args],
     { stdio: ['ignore', 'pipe', 'pipe'], env: process.env },
   );
-  let tail = '';
-  const keepTail = (d) => { tail = (tail + d.toString()).slice(-2000); };
-  child.stdout.on('data', keepTail);
-  child.stderr.on('data', keepTail);
-  child.on('exit', (code) => {
+  // stdout: keep just enough raw chunks to cover the last ~2000 bytes for the summary line; decode once at the end.
+  // stderr: relayed line by line as it arrives, so warnings and errors surface while the job runs (not only in the
+  // exit summary, and not at all on success); a partial line is held until its newline (bounded at 2000 chars).
+  const chunks = [];
+  let bytes = 0;
+  child.stdout.on('data', (d) => {
+    chunks.push(d); bytes += d.length;
+    while (chunks.length > 1 && bytes - chunks[0].length >= 2000) bytes -= chunks.shift().length;
+  });
+  let errLine = '';
+  const relay = (line) => { if (line.trim()) console.error(`[jobs] ${job.name}: ${line}`); };
+  child.stderr.setEncoding('utf8');
+  child.stderr.on('data', (d) => {
+    const lines = (errLine + d).split('\n');
+    errLine = lines.pop();
+    lines.forEach(relay);
+    if (errLine.length > 2000) { relay(errLine); errLine = ''; }
+  });
+  // 'close' (not 'exit'): fires after both pipes are drained, so no trailing output is lost
+  child.on('close', (code) => {
     running.delete(job.name);
+    relay(errLine);
+    const tail = Buffer.concat(chunks).toString().slice(-2000);
     const secs = ((Date.now() - t0) / 1000).toFixed(0);
     if (code === 0) console.log(`[jobs] ${job.name}: ok in ${secs}s — ${tail.trim().split('\n').pop() || ''}`);
     else console.error(`[jobs] ${job.name}: EXIT ${code} after ${secs}s\n${tail.trim()}`);
@@ -2,6 +2,8 @@
 //   node tool\score_predictions.js     (scheduled hourly)
 const { openDb } = require('./db');
 const db = openDb();
+// ts_utc is ISO text ('...T..:..:..000Z'); bounds are built in the same format so the comparison is a plain
+// ordered string compare (datetime() yields 'YYYY-MM-DD HH:MM:SS', which mis-orders against the 'T' separator)
 
 const updated = db.prepare(`
   UPDATE predictions SET
@@ -26,20 +28,16 @@ const betsScored = db.prepare(`
 const bs = db.prepare(`
   SELECT COUNT(*) n, SUM(realized_revenue) rev, SUM(exp_revenue) exp_rev,
     AVG(CASE WHEN realized_revenue > 0 THEN 1.0 ELSE 0 END) hit
-  FROM bets b
-  JOIN (SELECT ts_utc, MAX(run_at) mr FROM bets WHERE actionable=1 GROUP BY ts_utc) x
-    ON x.ts_utc=b.ts_utc AND x.mr=b.run_at
-  WHERE realized_revenue IS NOT NULL AND qty > 0 AND b.ts_utc >= datetime('now','-7 days')
+  FROM bets_locked
+  WHERE realized_revenue IS NOT NULL AND qty > 0 AND ts_utc >= strftime('%Y-%m-%dT%H:%M:%S.000Z','now','-7 days')
 `).get();
 
 const s = db.prepare(`
   SELECT COUNT(*) n,
     AVG(CASE WHEN (prob_long>0.5)=(realized_imb>0) THEN 1.0 ELSE 0 END) acc,
     AVG(ABS(price_p50-realized_price)) mae
-  FROM predictions p
-  JOIN (SELECT ts_utc, MAX(run_at) mr FROM predictions WHERE actionable=1 GROUP BY ts_utc) x
-    ON x.ts_utc=p.ts_utc AND x.mr=p.run_at
-  WHERE realized_imb IS NOT NULL AND p.ts_utc >= datetime('now','-7 days')
+  FROM pred_locked
+  WHERE realized_imb IS NOT NULL AND ts_utc >= strftime('%Y-%m-%dT%H:%M:%S.000Z','now','-7 days')
 `).get();
 
 console.log(`${new Date().toISOString()}: scored ${updated.changes} predictions, ${betsScored.changes} bets | 7d locked: n=${s.n} acc=${s.acc ? (s.acc * 100).toFixed(1) + '%' : '-'} priceMAE=${s.mae ? Math.round(s.mae) : '-'} | 7d bets: n=${bs.n} hit=${bs.hit !== null ? (bs.hit * 100).toFixed(0) + '%' : '-'} realized=${bs.rev !== null ? Math.round(bs.rev) + ' RON' : '-'} (expected ${bs.exp_rev !== null ? Math.round(bs.exp_rev) : '-'})`);
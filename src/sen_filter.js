@@ -18,6 +18,7 @@
 //     DJER = Đerdap / Iron Gates (RS)  PANCEVO21/PANCEVO22 = Pančevo (RS)  SAND = Sándorfalva (HU)  BEKE1 = Békéscsaba (HU)
 //     CHEA / CHEF = internal hydro nodes;  KUSJ/GOTE/PARO/S110/SIP_/COSE/CIOA/MINT/KIKI = other tie-lines/nodes
 //   We store the DECODED core (below) as columns + the FULL raw payload (JSON) so any field can be mined later.
+const { addColumns, tableColumns } = require('./db');
 const URL = 'https://www.transelectrica.ro/sen-filter';
 const HDRS = {
   'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124 Safari/537.36',
@@ -25,6 +26,17 @@ const HDRS = {
   'Referer': 'https://www.transelectrica.ro/web/tel/home',
 };
 const DECODE = { PROD: 'prod', CONS: 'cons', SOLD: 'sold', PLAN: 'plan', CARB: 'coal', GAZE: 'gas', NUCL: 'nuclear', APE: 'hydro', EOLIAN: 'wind', FOTO: 'solar', BMASA: 'biomass' };
+const DECODE_ENTRIES = Object.entries(DECODE);
+// prepared statements held per connection (the server keeps one handle for its lifetime and hits record/intervalAvg
+// every few seconds; backfillIntervals runs intervalAvg per interval) — prepared once, not on every call
+const stmtCache = new WeakMap();
+function stmt(db, sql) {
+  let m = stmtCache.get(db);
+  if (!m) stmtCache.set(db, (m = new Map()));
+  let st = m.get(sql);
+  if (!st) m.set(sql, (st = db.prepare(sql)));
+  return st;
+}
 const num = (v) => { const n = Number(v); return v !== null && v !== undefined && v !== '' && Number.isFinite(n) ? n : null; };
 // SCADA timestamp "YY/M/DD HH:MM:SS" (RO wall-clock) → "naive" ms (Europe/Bucharest wall-clock treated as UTC).
 // Used to bucket readings into intervals by their TRUE data time (not our ~1-min-lagged record time) and to
@@ -38,9 +50,11 @@ async function fetchSenFilter() {
   const r = await fetch(URL + '?_=' + Date.now(), { headers: HDRS });
   if (!r.ok) return null;
   const arr = await r.json();
-  const m = {}; for (const o of arr) for (const k in o) m[k] = o[k]; // flatten array of {key:val}
+  const m = Object.assign({}, ...arr); // flatten array of {key:val} in one native call
   const d = { ts: m.row1_HARTASEN_DATA || null, raw: m };
-  for (const [code, name] of Object.entries(DECODE)) d[name] = num(m[code]);
+  for (const [code, name] of DECODE_ENTRIES) d[name] = num(m[code]); // only the decoded fields are parsed
+  // SCADA time decoded once here — record() and the server's live rows reuse it on every cached read
+  d.tsMs = naiveMs(d.ts); d.si = tsInterval(d.ts);
   return d.sold !== null ? d : null;
 }
 
@@ -52,32 +66,46 @@ function ensureTable(db) {
     raw TEXT
   );
   CREATE INDEX IF NOT EXISTS ix_senlive_di ON sen_live(date_ro, isp);`);
-  try { db.exec('ALTER TABLE sen_live ADD COLUMN ts_ms INTEGER'); } catch { /* already present */ }
+  addColumns(db, { sen_live: { ts_ms: 'INTEGER' } });
   db.exec('CREATE INDEX IF NOT EXISTS ix_senlive_tsms ON sen_live(ts_ms)');
-  // backfill ts_ms (true SCADA time, naive ms) for any rows recorded before the column existed
+  // backfill ts_ms (true SCADA time, naive ms) for any rows recorded before the column existed — one set-based
+  // UPDATE with naiveMs registered as a SQL function, instead of loading every ts_feed and updating row by row
   try {
-    const need = db.prepare('SELECT ts_feed FROM sen_live WHERE ts_ms IS NULL').all();
-    if (need.length) { const upd = db.prepare('UPDATE sen_live SET ts_ms=? WHERE ts_feed=?'); db.exec('BEGIN'); for (const r of need) { const t = naiveMs(r.ts_feed); if (t != null) upd.run(t, r.ts_feed); } db.exec('COMMIT'); }
-  } catch (e) { try { db.exec('ROLLBACK'); } catch {} }
+    db.function('sen_naive_ms', { deterministic: true }, naiveMs);
+    db.exec('UPDATE sen_live SET ts_ms = sen_naive_ms(ts_feed) WHERE ts_ms IS NULL');
+  } catch { /* backfill is best-effort; new rows carry ts_ms */ }
 }
 
 // record one snapshot, deduped by the SCADA timestamp (PK) — so we keep every DISTINCT reading exactly once,
-// no matter how often it's polled. Returns true if a new row was stored.
+// no matter how often it's polled. Returns true if a new row was stored. The feed is polled faster than SCADA
+// ticks, so a snapshot this process already wrote is skipped before re-serializing its raw payload to JSON.
+let lastRecordedTs = null;
 function record(db, d, roDateIsp) {
-  if (!d || !d.ts) return false;
+  if (!d || !d.ts || d.ts === lastRecordedTs) return false;
   const ri = roDateIsp(new Date());
-  const info = db.prepare(`INSERT OR IGNORE INTO sen_live
+  const info = stmt(db, `INSERT OR IGNORE INTO sen_live
     (pulled_at, ts_feed, date_ro, isp, ts_ms, sold, plan, prod, cons, coal, gas, nuclear, hydro, wind, solar, biomass, raw)
     VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)`).run(
-    new Date().toISOString(), d.ts, ri.date, ri.isp, naiveMs(d.ts), d.sold, d.plan, d.prod, d.cons,
+    new Date().toISOString(), d.ts, ri.date, ri.isp, d.tsMs, d.sold, d.plan, d.prod, d.cons,
     d.coal, d.gas, d.nuclear, d.hydro, d.wind, d.solar, d.biomass, JSON.stringify(d.raw));
+  lastRecordedTs = d.ts;
   return info.changes > 0;
 }
 
+// ms since the last NEW snapshot was stored by ANOTHER writer (the server's live UI records too) — Infinity when the
+// newest row is the one this process just recorded, so a polling loop never skips because of its own capture.
+// sen_live is a rowid table filled in insert order, so the newest row is a single seek — no scan over pulled_at.
+function capturedAgoMs(db) {
+  const r = stmt(db, 'SELECT pulled_at, ts_feed FROM sen_live ORDER BY rowid DESC LIMIT 1').get();
+  return r && r.ts_feed !== lastRecordedTs ? Date.now() - Date.parse(r.pulled_at) : Infinity;
+}
+
 // ---- per-interval TIME-WEIGHTED average (energy-industry: Σ value×duration / Σ duration) over sen_live ----
 // CANONICAL impl — server.js intervalTWA delegates here; saveIntervalAvg persists it. Keep the weighting ONLY here.
+// tz formatters are costly to construct (ICU zone lookup) — build once, reuse per call
+const roWallFmt = new Intl.DateTimeFormat('en-GB', { timeZone: 'Europe/Bucharest', year: 'numeric', month: '2-digit', day: '2-digit', hour: '2-digit', minute: '2-digit', second: '2-digit', hour12: false });
 function roWallMs() {
-  const p = new Intl.DateTimeFormat('en-GB', { timeZone: 'Europe/Bucharest', year: 'numeric', month: '2-digit', day: '2-digit', hour: '2-digit', minute: '2-digit', second: '2-digit', hour12: false }).formatToParts(new Date());
+  const p = roWallFmt.formatToParts(new Date());
   const g = (t) => +p.find((x) => x.type === t).value;
   return Date.UTC(g('year'), g('month') - 1, g('day'), g('hour'), g('minute'), g('second')); // RO wall-clock naive ms
 }
@@ -88,12 +116,12 @@ function intervalAvg(db, dateRo, isp) {
   // End the integration at the latest SCADA timestamp ("scada now"), NOT the wall clock — so the denominator is the
   // seconds ELAPSED BY SCADA TIME (latest SCADA ts − interval start), and the last reading is never extrapolated
   // across the feed's ~1-min lag. Past intervals: scadaNow >> tFull → full 15 min. Current: up to the freshest reading.
-  let scadaNow = tStart + 1; try { const r = db.prepare('SELECT MAX(ts_ms) m FROM sen_live WHERE ts_ms IS NOT NULL').get(); if (r && r.m) scadaNow = r.m; } catch { /* ignore */ }
+  let scadaNow = tStart + 1; try { const r = stmt(db, 'SELECT MAX(ts_ms) m FROM sen_live WHERE ts_ms IS NOT NULL').get(); if (r && r.m) scadaNow = r.m; } catch { /* ignore */ }
   const tEnd = Math.min(tFull, Math.max(scadaNow, tStart + 1)); // completed → full 15min; current → scada-elapsed
   let inWin, carry;
   try {
-    inWin = db.prepare('SELECT ts_ms, sold FROM sen_live WHERE ts_ms >= ? AND ts_ms < ? AND sold IS NOT NULL ORDER BY ts_ms').all(tStart, tEnd);
-    carry = db.prepare('SELECT sold FROM sen_live WHERE ts_ms < ? AND sold IS NOT NULL ORDER BY ts_ms DESC LIMIT 1').get(tStart);
+    inWin = stmt(db, 'SELECT ts_ms, sold FROM sen_live WHERE ts_ms >= ? AND ts_ms < ? AND sold IS NOT NULL ORDER BY ts_ms').all(tStart, tEnd);
+    carry = stmt(db, 'SELECT sold FROM sen_live WHERE ts_ms < ? AND sold IS NOT NULL ORDER BY ts_ms DESC LIMIT 1').get(tStart);
   } catch { return null; }
   const segs = [];
   if (carry) segs.push({ t: tStart, sold: carry.sold }); // carry fills [tStart, first reading]
@@ -107,6 +135,7 @@ function intervalAvg(db, dateRo, isp) {
   return { avgSold, avgRealxb: -avgSold, n: segs.length, tStart, complete: tEnd >= tFull };
 }
 function ensureIntervalTable(db) {
+  if (tableColumns(db).has('sen_interval')) return; // called per page render; skip the DDL once it exists
   db.exec(`CREATE TABLE IF NOT EXISTS sen_interval (
     date_ro TEXT, isp INTEGER, avg_sold REAL, avg_realxb REAL, n INTEGER, saved_at TEXT,
     PRIMARY KEY (date_ro, isp)
@@ -117,7 +146,7 @@ function ensureIntervalTable(db) {
 function saveIntervalAvg(db, dateRo, isp) {
   const r = intervalAvg(db, dateRo, isp);
   if (!r || !r.complete) return false;
-  db.prepare(`INSERT INTO sen_interval (date_ro, isp, avg_sold, avg_realxb, n, saved_at) VALUES (?,?,?,?,?,?)
+  stmt(db, `INSERT INTO sen_interval (date_ro, isp, avg_sold, avg_realxb, n, saved_at) VALUES (?,?,?,?,?,?)
     ON CONFLICT(date_ro, isp) DO UPDATE SET avg_sold=excluded.avg_sold, avg_realxb=excluded.avg_realxb, n=excluded.n, saved_at=excluded.saved_at`)
     .run(dateRo, isp, +r.avgSold.toFixed(2), +r.avgRealxb.toFixed(2), r.n, new Date().toISOString());
   return true;
@@ -127,7 +156,8 @@ function saveIntervalAvg(db, dateRo, isp) {
 function backfillIntervals(db, { maxNew = 500, refinishMin = 4 } = {}) {
   ensureIntervalTable(db);
   const roNow = roWallMs();
-  const ivs = db.prepare('SELECT DISTINCT date_ro, isp FROM sen_live').all();
+  // ordered by the (date_ro, isp) index itself — no JS sort with a string-building comparator afterwards
+  const ivs = db.prepare('SELECT DISTINCT date_ro, isp FROM sen_live ORDER BY date_ro, isp').all();
   const saved = new Set(db.prepare('SELECT date_ro, isp FROM sen_interval').all().map((r) => r.date_ro + '|' + r.isp));
   const todo = [];
   for (const { date_ro, isp } of ivs) {
@@ -137,10 +167,9 @@ function backfillIntervals(db, { maxNew = 500, refinishMin = 4 } = {}) {
     const already = saved.has(date_ro + '|' + isp);
     if (!already || tEnd > roNow - refinishMin * 60000) todo.push({ date_ro, isp, already });
   }
-  todo.sort((a, b) => (a.date_ro + String(a.isp).padStart(3, '0')).localeCompare(b.date_ro + String(b.isp).padStart(3, '0')));
   let n = 0, newN = 0;
   for (const it of todo) { if (!it.already) { if (newN >= maxNew) continue; newN++; } if (saveIntervalAvg(db, it.date_ro, it.isp)) n++; }
   return n;
 }
 
-module.exports = { fetchSenFilter, ensureTable, record, naiveMs, tsInterval, intervalAvg, ensureIntervalTable, saveIntervalAvg, backfillIntervals, roWallMs, DECODE, URL };
+module.exports = { fetchSenFilter, ensureTable, record, capturedAgoMs, naiveMs, tsInterval, intervalAvg, ensureIntervalTable, saveIntervalAvg, backfillIntervals, roWallMs, DECODE, URL };
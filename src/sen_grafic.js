@@ -0,0 +1,27 @@
+// Transelectrica live SEN feed (real-time national prod/cons/balance + per-source) — shared by server.js liveSEN
+// and log_xb_pi.js, so the URL and the row decode live in ONE place.
+// Hidden Liferay resource endpoint behind the "Stare SEN in timp real" page. Comma/pipe/semicolon
+// delimited: rows split by '|', fields by ';' = time;Consum;AvgConsum;Productie;Sold;Coal;Hydro;
+// Gas;Nuclear;Wind;Solar;Biomass. ~10-min cadence, fresh to the minute, date-range capable.
+const pre = '&_SENGrafic_WAR_SENGraficportlet_';
+// time;Consum;AvgConsum;Productie;Sold + at least 7 more fields (rows with < 12 fields are skipped)
+const SEN_ROW_RE = /(\d{2})-(\d{2})-(\d{4}) (\d{2}):(\d{2})[^;|]*;([^;|]*);[^;|]*;([^;|]*);([^;|]*)(?:;[^;|]*){7}/g;
+
+// whole RO day (YYYY-MM-DD) 00:00..23:59; `random` busts the portlet cache
+function senGraficUrl(date) {
+  const [y, mo, d] = date.split('-');
+  return 'https://www.transelectrica.ro/widget/web/tel/sen-grafic?p_p_id=SENGrafic_WAR_SENGraficportlet&p_p_lifecycle=2&p_p_state=maximized&p_p_mode=view&p_p_cacheability=cacheLevelPage'
+    + pre + 'random=' + Date.now()
+    + pre + 'start_day=' + (+d) + pre + 'start_month=' + (+mo) + pre + 'start_year=' + y + pre + 'start_Hour=0' + pre + 'start_Minute=0'
+    + pre + 'end_day=' + (+d) + pre + 'end_month=' + (+mo) + pre + 'end_year=' + y + pre + 'end_Hour=23' + pre + 'end_Minute=59';
+}
+
+// payload → Map(isp -> { cons, prod, sold }). One regex scan over the payload instead of splitting every row into
+// 12 strings (only 3 fields are used); RO-local minutes → ISP, last sample in an interval wins.
+function parseSenGrafic(text) {
+  const map = new Map();
+  for (const m of text.matchAll(SEN_ROW_RE)) map.set(Math.floor((+m[4] * 60 + +m[5]) / 15) + 1, { cons: +m[6], prod: +m[7], sold: +m[8] });
+  return map;
+}
+
+module.exports = { senGraficUrl, parseSenGrafic };
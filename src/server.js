@@ -11,7 +11,8 @@
 const http = require('http');
 const fs = require('fs');
 const path = require('path');
-const { openDb, roDateIsp } = require('./db');
+const zlib = require('zlib');
+const { openDb, roDateIsp, addColumns } = require('./db');
 
 const PORT = process.env.PORT || 8077;
 const db = openDb();
@@ -29,9 +30,7 @@ db.exec(`
     date_ro TEXT PRIMARY KEY, unlocked INTEGER NOT NULL, updated_at TEXT
   );
 `);
-try { db.exec(`ALTER TABLE user_bets ADD COLUMN user TEXT`); } catch { /* exists */ }
-try { db.exec(`ALTER TABLE user_bets_log ADD COLUMN user TEXT`); } catch { /* exists */ }
-try { db.exec(`ALTER TABLE page_unlocks ADD COLUMN user TEXT`); } catch { /* exists */ }
+addColumns(db, { user_bets: { user: 'TEXT' }, user_bets_log: { user: 'TEXT' }, page_unlocks: { user: 'TEXT' } });
 
 // first-boot safety: the pages query these before the first predict job has created them
 db.exec(`
@@ -53,28 +52,46 @@ db.exec(`
   -- were full-scanning 200k+ rows; scoping them to date_ro makes each a ~few-hundred-row covering seek
   CREATE INDEX IF NOT EXISTS idx_pred_day ON predictions(date_ro, ts_utc, run_at, actionable);
   CREATE INDEX IF NOT EXISTS idx_bets_day ON bets(date_ro, ts_utc, run_at, actionable);
+  CREATE INDEX IF NOT EXISTS idx_bets_target ON bets(ts_utc, actionable, run_at); -- bets_locked per-interval seek
 `);
 // materialized fast tables the app reads from (populated by the pull_weather + train_models jobs, which run within
 // ~30s of boot then on schedule; readers fall back gracefully until first populated).
 db.exec('CREATE TABLE IF NOT EXISTS weather_hourly(ts_utc TEXT, var TEXT, value REAL, pulled_at TEXT, PRIMARY KEY(ts_utc,var))');
 db.exec('CREATE TABLE IF NOT EXISTS model_cache(name TEXT PRIMARY KEY, json TEXT, trained_at TEXT)');
 
+// called on most requests (several times per page render): a stat (no read/parse) decides whether the cached
+// config is still current, and that stat result is itself reused for CONFIG_RECHECK_MS — edits to config.json
+// still apply without a restart, within a few seconds
+const CONFIG_PATH = path.join(__dirname, '..', 'config.json');
+const CONFIG_RECHECK_MS = 5000;
+let configCache = { mtime: null, cfg: null, checkedAt: 0 };
 function loadConfig() {
+  const now = Date.now();
+  if (configCache.cfg && now - configCache.checkedAt < CONFIG_RECHECK_MS) return configCache.cfg;
   const defaults = { eur_ron: 5.24, trade_window_cet: [7, 22], max_mwh_per_isp: 2.5, min_mwh_per_isp: 2.0, risk_aversion: 0.5 };
   // LOCAL: config lives in tool/ next to this file (cloud uses ../config.json)
-  try { return { ...defaults, ...JSON.parse(fs.readFileSync(path.join(__dirname, '..', 'config.json'), 'utf8').replace(/^﻿/, '')) }; }
+  const st = fs.statSync(CONFIG_PATH, { throwIfNoEntry: false });
+  if (!st) { configCache = { mtime: null, cfg: defaults, checkedAt: now }; return defaults; }
+  if (configCache.mtime === st.mtimeMs) { configCache.checkedAt = now; return configCache.cfg; }
+  try { configCache = { mtime: st.mtimeMs, cfg: { ...defaults, ...JSON.parse(fs.readFileSync(CONFIG_PATH, 'utf8').replace(/^﻿/, '')) }, checkedAt: now }; return configCache.cfg; }
   catch { return defaults; }
 }
 
 const pad = (n) => String(n).padStart(2, '0');
-const ispLabel = (isp) => `${pad(Math.floor((isp - 1) / 4))}:${['00', '15', '30', '45'][(isp - 1) % 4]}`;
+// ISP time labels are formatted once for ISPs 1..100 (fall-DST days have 100) and looked up per table row
+const ISP_LABELS = Array.from({ length: 101 }, (_, isp) => `${pad(Math.floor((isp - 1) / 4))}:${['00', '15', '30', '45'][(isp - 1) % 4]}`);
+const ispLabel = (isp) => ISP_LABELS[isp];
 // market time (CET) of the ISP start; ISPs 1-4 fall on the previous CET evening
-const cetLabel = (isp) => {
+const CET_LABELS = Array.from({ length: 101 }, (_, isp) => {
   let m = (isp - 1) * 15 - 60;
   const prev = m < 0;
   if (prev) m += 1440;
   return `${pad(Math.floor(m / 60))}:${pad(m % 60)}${prev ? '<small>−1d</small>' : ''}`;
-};
+});
+const cetLabel = (isp) => CET_LABELS[isp];
+// CET wall-clock formatters, built once (toLocaleTimeString with a timeZone constructs a new formatter per call)
+const CET_HMS = new Intl.DateTimeFormat('en-GB', { timeZone: 'Europe/Berlin', hour: '2-digit', minute: '2-digit', second: '2-digit', hour12: false });
+const CET_HM = new Intl.DateTimeFormat('en-GB', { timeZone: 'Europe/Berlin', hour: '2-digit', minute: '2-digit', hour12: false });
 const addDays = (dateStr, n) => new Date(new Date(dateStr + 'T12:00:00Z').getTime() + n * 86400000).toISOString().slice(0, 10);
 const euDate = (d) => `${d.slice(8, 10)}.${d.slice(5, 7)}.${d.slice(0, 4)}`;
 const dayTitle = (d) => ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday'][new Date(d + 'T12:00:00Z').getUTCDay()] + ' ' + euDate(d);
@@ -90,7 +107,9 @@ const earlyPrice = (imb, qUp, qDn, vUp, vDn) => {
   if (imb === null) return null; // need the direction; imb publishes with/before the price and skips placeholder future rows
   return imb > 0 ? (qDn ? vDn / qDn : null) : (qUp ? vUp / qUp : null);
 };
-const provPriceSpan = (v) => `<span style="opacity:.55;font-style:italic" title="computed from balancing energy (ΣQ·P ÷ ΣQ) — DAMAS has not published the official price yet">~${Math.round(v).toLocaleString('en-US')}</span>`;
+// thousands-separated integers for the HTML tables: one formatter built at load instead of a locale lookup per cell
+const INT_FMT = new Intl.NumberFormat('en-US', { maximumFractionDigits: 0 });
+const provPriceSpan = (v) => `<span style="opacity:.55;font-style:italic" title="computed from balancing energy (ΣQ·P ÷ ΣQ) — DAMAS has not published the official price yet">~${INT_FMT.format(Math.round(v))}</span>`;
 
 // X-B Δ varies within an interval as the Real-X-B (SEN) side firms up; log_xb_pi.js records the live delta
 // each minute into xb_delta_snap. Show the interval-AVERAGE of those recordings + a drift arrow (↑/↓ = the
@@ -98,11 +117,12 @@ const provPriceSpan = (v) => `<span style="opacity:.55;font-style:italic" title=
 function xbDeltaAgg(date) {
   const m = new Map();
   try {
-    const by = new Map();
-    for (const r of db.prepare('SELECT isp, delta FROM xb_delta_snap WHERE date_ro=? ORDER BY pulled_at').all(date)) {
-      if (!by.has(r.isp)) by.set(r.isp, []); by.get(r.isp).push(r.delta);
+    // running tallies per isp (sum/n/first/last) — no per-interval arrays just to average them afterwards
+    for (const r of db.prepare('SELECT isp, delta FROM xb_delta_snap WHERE date_ro=? ORDER BY pulled_at').iterate(date)) {
+      const e = m.get(r.isp);
+      if (e) { e.sum += r.delta; e.n++; e.last = r.delta; } else m.set(r.isp, { sum: r.delta, n: 1, first: r.delta, last: r.delta });
     }
-    for (const [isp, a] of by) m.set(isp, { avg: a.reduce((s, v) => s + v, 0) / a.length, n: a.length, first: a[0], last: a[a.length - 1] });
+    for (const e of m.values()) e.avg = e.sum / e.n;
   } catch { /* table not created yet */ }
   return m;
 }
@@ -112,10 +132,12 @@ function xbDeltaAgg(date) {
 function xbPiChange(date) {
   const m = new Map();
   try {
-    const rows = db.prepare('SELECT isp, commercial FROM xb_pi_snap WHERE date_ro=? AND commercial IS NOT NULL ORDER BY isp, pulled_at').all(date);
-    const byIsp = new Map();
-    for (const r of rows) { if (!byIsp.has(r.isp)) byIsp.set(r.isp, []); byIsp.get(r.isp).push(r.commercial); }
-    for (const [isp, v] of byIsp) { let last = null; for (let i = 1; i < v.length; i++) { const d = v[i] - v[i - 1]; if (Math.abs(d) >= 1) last = d; } if (last !== null) m.set(isp, last); }
+    // rows arrive grouped by isp in time order: one pass comparing each frame with the previous one of the same isp
+    let prevIsp = null, prev = null;
+    for (const r of db.prepare('SELECT isp, commercial FROM xb_pi_snap WHERE date_ro=? AND commercial IS NOT NULL ORDER BY isp, pulled_at').iterate(date)) {
+      if (r.isp === prevIsp) { const d = r.commercial - prev; if (Math.abs(d) >= 1) m.set(r.isp, d); }
+      prevIsp = r.isp; prev = r.commercial;
+    }
   } catch { /* table not created yet */ }
   return m;
 }
@@ -157,16 +179,19 @@ const wxCell = (wx) => {
 // A historical reference row for the SAME interval on an earlier day (the −1d/−2d rows under an expanded interval, and
 // under the trade row). Sourced from `series` (settled DAMAS) + sen_interval (real X-B avg); 18-col aligned; columns
 // without clean history stay blank. `gate` → green grouping box (trade row); else neutral. data-pisp ties it to its parent.
+const HIST_SERIES = ['damas_est_sys_imbalance', 'damas_est_price_pos', 'damas_notif_prod', 'damas_notif_cons', 'damas_cons_real',
+  'damas_sx_rohu', 'damas_sx_robg', 'damas_sx_rors', 'damas_sx_roua', 'damas_sx_romd', 'damas_sx_huro', 'damas_sx_bgro', 'damas_sx_rsro', 'damas_sx_uaro', 'damas_sx_mdro',
+  'gen_actual_solar', 'gen_actual_wind_onshore', 'gen_actual_hydro_reservoir', 'gen_actual_hydro_ror', 'gen_actual_nuclear', 'gen_actual_gas', 'gen_actual_hard_coal', 'gen_actual_lignite', 'gen_actual_biomass', 'gen_actual_B25'];
+// prepared once: every ⓘ expand renders two history rows with the same two lookups
+const _histStmt = db.prepare(`SELECT series, value FROM series WHERE date_ro=? AND isp=? AND series IN (${HIST_SERIES.map(() => '?').join(',')})`);
+let _histRxbStmt = null; // sen_interval is created by the SEN capture, so prepare on first use
 function histRowHtml(d, isp, label, last, gate) {
-  const f = (v) => (v === null || v === undefined ? '' : Math.round(v).toLocaleString('en-US'));
+  const f = (v) => (v === null || v === undefined ? '' : INT_FMT.format(Math.round(v)));
   const ar = (v) => (v === null || v === undefined ? '' : `${v >= 0 ? '↑' : '↓'}${Math.round(Math.abs(v))}`);
   const dl = (v) => (v === null || v === undefined ? '' : `<span class="${v >= 0 ? 'pos' : 'neg'}">${v >= 0 ? '+' : ''}${Math.round(v)}</span>`);
-  const need = ['damas_est_sys_imbalance', 'damas_est_price_pos', 'damas_notif_prod', 'damas_notif_cons', 'damas_cons_real',
-    'damas_sx_rohu', 'damas_sx_robg', 'damas_sx_rors', 'damas_sx_roua', 'damas_sx_romd', 'damas_sx_huro', 'damas_sx_bgro', 'damas_sx_rsro', 'damas_sx_uaro', 'damas_sx_mdro',
-    'gen_actual_solar', 'gen_actual_wind_onshore', 'gen_actual_hydro_reservoir', 'gen_actual_hydro_ror', 'gen_actual_nuclear', 'gen_actual_gas', 'gen_actual_hard_coal', 'gen_actual_lignite', 'gen_actual_biomass', 'gen_actual_B25'];
   const m = {};
-  try { for (const r of db.prepare(`SELECT series, value FROM series WHERE date_ro=? AND isp=? AND series IN (${need.map(() => '?').join(',')})`).all(d, isp, ...need)) m[r.series] = r.value; } catch { /* ignore */ }
-  let rxb = null; try { const r = db.prepare('SELECT avg_realxb FROM sen_interval WHERE date_ro=? AND isp=?').get(d, isp); if (r) rxb = r.avg_realxb; } catch { /* ignore */ }
+  try { for (const r of _histStmt.iterate(d, isp, ...HIST_SERIES)) m[r.series] = r.value; } catch { /* ignore */ }
+  let rxb = null; try { _histRxbStmt = _histRxbStmt || db.prepare('SELECT avg_realxb FROM sen_interval WHERE date_ro=? AND isp=?'); const r = _histRxbStmt.get(d, isp); if (r) rxb = r.avg_realxb; } catch { /* ignore */ }
   const imb = m['damas_est_sys_imbalance'] ?? null, price = m['damas_est_price_pos'] ?? null;
   const np = m['damas_notif_prod'] ?? null, nc = m['damas_notif_cons'] ?? null, rc = m['damas_cons_real'] ?? null;
   let nxb = null, any = false;
@@ -180,7 +205,7 @@ function histRowHtml(d, isp, label, last, gate) {
   const rso = ga('solar'), rwi = ga('wind_onshore'), rhy = (ga('hydro_reservoir') || 0) + (ga('hydro_ror') || 0), rnu = ga('nuclear');
   const rprodCell = rprod === null ? '' : f(rprod) + ` <span class="prodmix">| <span title="solar">☀️${Math.round(rso || 0)}</span><span title="wind">💨${Math.round(rwi || 0)}</span><span title="hydro">💧${Math.round(rhy)}</span><span title="nuclear">⚛️${Math.round(rnu || 0)}</span><span title="other (coal/gas/biomass)">🔥${Math.max(0, Math.round(rprod - (rso || 0) - (rwi || 0) - rhy - (rnu || 0)))}</span></span>`;
   // weather as it was at that interval's hour
-  let wxTxt = ''; try { const t = dayTimestamps(d).find((x) => x.isp === isp); if (t) { const wx = wxAtHour(new Date(t.ts).toISOString().slice(0, 13) + ':00:00Z'); if (wx && (wx.cloud != null || wx.windReal != null)) wxTxt = `${skyIcon(wx.cloud)}${wx.windReal != null ? ' 💨' + Math.round(wx.windReal) : ''}`; } } catch { /* ignore */ }
+  let wxTxt = ''; try { const t = ispTs(d, isp); if (t) { const wx = wxAtHour(t.ts.slice(0, 13) + ':00:00Z'); if (wx && (wx.cloud != null || wx.windReal != null)) wxTxt = `${skyIcon(wx.cloud)}${wx.windReal != null ? ' 💨' + Math.round(wx.windReal) : ''}`; } } catch { /* ignore */ }
   return `<tr class="histrow ${gate ? 'hg' : 'hx'}${last ? ' histrow-last' : ''}" data-pisp="${isp}"><td title="same interval, ${d}"><span class="histlbl">${label}</span></td><td><small>${cetLabel(isp)}</small></td>`
     + `<td>${imb !== null ? dirIcon(imb > 0) + ' ' + f(Math.abs(imb)) : ''}</td>`
     + `<td>${price !== null ? f(price) + ' <small class="cur">lei</small>' : ''}</td>`
@@ -256,44 +281,70 @@ function utcForLocalHour(dateStr, hour) {
   return new Date(base + (hour - 2) * 3600000);
 }
 
-// 96 UTC timestamps of a RO delivery day
+// 96 UTC timestamps of a RO delivery day. Memoized per date (called many times per render and every minute by
+// the lock/panic loop); the shared arrays are frozen so no caller can mutate another's view.
+const dayTsCache = new Map();
 function dayTimestamps(dateStr) {
+  let out = dayTsCache.get(dateStr);
+  if (out) return out;
   const start = utcForLocalHour(dateStr, 0);
-  const out = [];
+  out = [];
   for (let i = 0; i < 110; i++) {
     const d = new Date(start.getTime() + i * 900000);
     if (roDateIsp(d).date !== dateStr) break;
-    out.push({ isp: i + 1, ts: d.toISOString().slice(0, 19) + '.000Z' });
+    out.push(Object.freeze({ isp: i + 1, ts: d.toISOString().slice(0, 19) + '.000Z' }));
   }
+  if (dayTsCache.size >= 64) dayTsCache.delete(dayTsCache.keys().next().value); // oldest first
+  dayTsCache.set(dateStr, Object.freeze(out));
   return out;
 }
+// the day's entry for one ISP — entries are laid out isp-1 by index, so a direct read, not a find() scan
+const ispTs = (dateStr, isp) => dayTimestamps(dateStr)[isp - 1];
 
 const lockTimeFor = (deliveryDate) => utcForLocalHour(addDays(deliveryDate, -1), 11); // 10:00 CET = 11:00 EET
-const isUnlocked = (date) => !!db.prepare('SELECT unlocked FROM page_unlocks WHERE date_ro=?').get(date)?.unlocked;
+const _unlockStmt = db.prepare('SELECT unlocked FROM page_unlocks WHERE date_ro=?');
+const isUnlocked = (date) => !!_unlockStmt.get(date)?.unlocked;
 const isLocked = (date) => Date.now() >= lockTimeFor(date).getTime() && !isUnlocked(date);
 
 const seriesAt = db.prepare('SELECT value FROM series WHERE series=? AND ts_utc=?');
 const sv = (name, ts) => { const r = seriesAt.get(name, ts); return r ? r.value : null; };
+// every value of the given series on one RO day in a single query; returns an sv-compatible (name, ts) lookup so
+// per-interval page loops don't issue one query per series per ISP (names not listed read as null)
+function daySeries(date, names) {
+  const m = new Map();
+  for (const r of db.prepare(`SELECT series, ts_utc, value FROM series WHERE date_ro=? AND series IN (${names.map(() => '?').join(',')})`).iterate(date, ...names)) m.set(r.series + '|' + r.ts_utc, r.value);
+  return (name, ts) => m.get(name + '|' + ts) ?? null;
+}
+// freshest non-null value of a series at or before a cutoff (single-row seek on the PK)
+const _lastAtStmt = db.prepare('SELECT value FROM series WHERE series=? AND value IS NOT NULL AND ts_utc<=? ORDER BY ts_utc DESC LIMIT 1');
+
+// list queries project only what the pages render (predictions/bets rows also carry run/target/version/realized columns)
+const PZU_PRED_COLS = 'isp, prob_long, imb_p50, price_p10, price_p50, price_p90';
+const PZU_BET_COLS = 'isp, dir, qty, exp_edge, exp_price, reason, tail_loss, realized_revenue';
+const PI_PRED_COLS = 'isp, prob_long, price_p50, imb_p50';
+
+// latest run for a day, optionally capped at a decision time (pass MAX_RUN for "no cap"): one statement per table
+// shared by the locked and live views instead of two near-identical queries compiled per page render
+const MAX_RUN = '9999';
+const _predRunStmt = db.prepare('SELECT MAX(run_at) m FROM predictions WHERE date_ro=? AND run_at<=?');
+const _betRunStmt = db.prepare('SELECT MAX(run_at) m FROM bets WHERE date_ro=? AND run_at<=?');
 
 function pzuData(date) {
   const cfg = loadConfig();
+  const sv = daySeries(date, ['pzu_ron', 'da_price', 'damas_est_price_pos', 'damas_est_sys_imbalance']);
   const [h0, h1] = cfg.trade_window_cet;
   const ispFrom = (h0 + 1) * 4 + 1, ispTo = (h1 + 1) * 4 + 1; // +1 → include the wh1:00-starting row (e.g. 22:00)
   const lockAt = lockTimeFor(date).toISOString();
   const locked = isLocked(date);
 
   // prediction view: decision-time (<= lockAt) for locked/past days, latest otherwise
-  const predRun = locked
-    ? db.prepare('SELECT MAX(run_at) m FROM predictions WHERE run_at<=? AND date_ro=?').get(lockAt, date).m
-    : db.prepare('SELECT MAX(run_at) m FROM predictions WHERE date_ro=?').get(date).m;
+  const predRun = _predRunStmt.get(date, locked ? lockAt : MAX_RUN).m;
   const preds = predRun
-    ? new Map(db.prepare('SELECT * FROM predictions WHERE run_at=? AND date_ro=?').all(predRun, date).map((r) => [r.isp, r]))
+    ? new Map(db.prepare(`SELECT ${PZU_PRED_COLS} FROM predictions WHERE run_at=? AND date_ro=?`).all(predRun, date).map((r) => [r.isp, r]))
     : new Map();
-  const betRun = locked
-    ? db.prepare('SELECT MAX(run_at) m FROM bets WHERE run_at<=? AND date_ro=?').get(lockAt, date).m
-    : db.prepare('SELECT MAX(run_at) m FROM bets WHERE date_ro=?').get(date).m;
+  const betRun = _betRunStmt.get(date, locked ? lockAt : MAX_RUN).m;
   const advice = betRun
-    ? new Map(db.prepare('SELECT * FROM bets WHERE run_at=? AND date_ro=?').all(betRun, date).map((r) => [r.isp, r]))
+    ? new Map(db.prepare(`SELECT ${PZU_BET_COLS} FROM bets WHERE run_at=? AND date_ro=?`).all(betRun, date).map((r) => [r.isp, r]))
     : new Map();
   const userBets = new Map(db.prepare('SELECT isp, qty, source FROM user_bets WHERE date_ro=?').all(date).map((r) => [r.isp, r]));
   // xb_combo D-1 colour signal (SHADOW — live-scored, does NOT drive the position; staged rollout 2026-06-19)
@@ -732,8 +783,8 @@ function pzuPage(date) {
       : '';
   const dayTotal = anyResult ? totalResult : anyModel ? totalModel : null;
   const extras = `
-    ${dayTotal !== null ? `<span class="totalpill r2 ${dayTotal >= 0 ? 'tp-pos' : 'tp-neg'}" title="${anyResult ? 'your realized day total' : 'model realized day total'}">${Math.round(dayTotal).toLocaleString('en-US')} RON</span>` : ''}
-    <span class="pill2 r2" title="expected day total at decision time"><small>exp</small> ${expTotal !== null ? Math.round(expTotal).toLocaleString('en-US') : '—'}</span>
+    ${dayTotal !== null ? `<span class="totalpill r2 ${dayTotal >= 0 ? 'tp-pos' : 'tp-neg'}" title="${anyResult ? 'your realized day total' : 'model realized day total'}">${INT_FMT.format(Math.round(dayTotal))} RON</span>` : ''}
+    <span class="pill2 r2" title="expected day total at decision time"><small>exp</small> ${expTotal !== null ? INT_FMT.format(Math.round(expTotal)) : '—'}</span>
     ${accPill}
     ${colPicker('cols-pzu')}`;
   return `<!DOCTYPE html><html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1"><link rel="manifest" href="/manifest.json"><meta name="theme-color" content="#FFF500"><meta name="apple-mobile-web-app-capable" content="yes"><meta name="apple-mobile-web-app-title" content="GAN Trading"><link rel="apple-touch-icon" href="/icon-180.png"><title>PZU ${date}</title>${STYLE}</head><body>
@@ -748,8 +799,8 @@ ${NAV('pzu', date, null, extras)}<div class="content">
 <table><tr><th>Interval</th><th>CET</th><th>Prediction</th><th title="predicted imbalance, MWh">Imbalance</th><th title="predicted imbalance price, RON/MWh">Price</th><th title="PZU price, RON/MWh">PZU</th><th title="external RO Signal Override desk — BUY/SELL/HOLD + Q (MW). Night intervals are BUY/HOLD only. Replaces our old model advice as the position.">Desk (PZU)</th><th title="xb_combo day-ahead-commitment colour signal — SHADOW, live-scored, NOT driving the position yet">Combo<br><small>shadow</small></th><th title="MWh, PZU-side action">Your position</th><th title="realized imbalance price, RON/MWh">Realized</th><th title="RON">Model result</th><th title="RON">Result</th></tr>
 ${rows}
 ${anyResult || anyModel ? `<tr><td colspan="10" style="text-align:right"><b>Day total</b></td>
-<td>${anyModel ? `<b class="${totalModel >= 0 ? 'pos' : 'neg'}">${Math.round(totalModel).toLocaleString('en-US')} RON</b>` : ''}</td>
-<td>${anyResult ? `<b class="${totalResult >= 0 ? 'pos' : 'neg'}">${Math.round(totalResult).toLocaleString('en-US')} RON</b>` : ''}</td></tr>` : ''}
+<td>${anyModel ? `<b class="${totalModel >= 0 ? 'pos' : 'neg'}">${INT_FMT.format(Math.round(totalModel))} RON</b>` : ''}</td>
+<td>${anyResult ? `<b class="${totalResult >= 0 ? 'pos' : 'neg'}">${INT_FMT.format(Math.round(totalResult))} RON</b>` : ''}</td></tr>` : ''}
 </table>
 <script>
 const DATE=${JSON.stringify(date)};
@@ -786,16 +837,18 @@ async function lockAgain(){await fetch('/api/lock',{method:'POST',headers:{'Cont
 
 function piPage(date) {
   const cfg = loadConfig();
+  const sv = daySeries(date, ['damas_est_sys_imbalance', 'damas_est_price_pos', 'pzu_ron', 'da_price', 'gen_fc_da',
+    'damas_consumption', 'load_actual', 'load_fc_da', 'net_pos_da']);
   const lockAt = lockTimeFor(date).toISOString();
   // D-1 10:00 CET view — what the PZU decision was based on
-  const d1Run = db.prepare('SELECT MAX(run_at) m FROM predictions WHERE run_at<=? AND date_ro=?').get(lockAt, date).m;
+  const d1Run = _predRunStmt.get(date, lockAt).m;
   const d1 = d1Run
-    ? new Map(db.prepare('SELECT * FROM predictions WHERE run_at=? AND date_ro=?').all(d1Run, date).map((r) => [r.isp, r]))
+    ? new Map(db.prepare(`SELECT ${PI_PRED_COLS} FROM predictions WHERE run_at=? AND date_ro=?`).all(d1Run, date).map((r) => [r.isp, r]))
     : new Map();
   // latest live view (only contains upcoming ISPs)
-  const liveRun = db.prepare('SELECT MAX(run_at) m FROM predictions WHERE date_ro=?').get(date).m;
+  const liveRun = _predRunStmt.get(date, MAX_RUN).m;
   const live = liveRun
-    ? new Map(db.prepare('SELECT * FROM predictions WHERE run_at=? AND date_ro=?').all(liveRun, date).map((r) => [r.isp, r]))
+    ? new Map(db.prepare(`SELECT ${PI_PRED_COLS} FROM predictions WHERE run_at=? AND date_ro=?`).all(liveRun, date).map((r) => [r.isp, r]))
     : new Map();
   // PI-locked view: last prediction issued >= 75 min before each ISP (the binding one)
   const piLocked = new Map(db.prepare(`
@@ -812,14 +865,20 @@ function piPage(date) {
     WHERE date_ro=? AND (series LIKE 'gen_actual_%' OR series LIKE 'flow_%' OR series LIKE 'sched_%')
   `).all(date);
   const genMap = new Map(), flowMap = new Map(), schedMap = new Map();
+  const XB_CC = ['HU', 'BG', 'RS', 'UA', 'MD'];
+  const XB_SLOT = new Map(XB_CC.flatMap((cc, i) => [[cc + '_RO', i * 2], ['RO_' + cc, i * 2 + 1]])); // 'HU_RO' → import slot
   for (const r of sysRows) {
     if (r.series.startsWith('gen_actual_')) {
       if (!genMap.has(r.ts_utc)) genMap.set(r.ts_utc, {});
       genMap.get(r.ts_utc)[r.series.slice(11)] = r.value;
     } else {
+      // border legs go into one flat Float64Array per ts: [HU in, HU out, BG in, BG out, ...], NaN = not published.
+      // The series name is decoded once here instead of template-building 10 keys per lookup in xbNet.
       const m = r.series.startsWith('flow_') ? flowMap : schedMap;
-      if (!m.has(r.ts_utc)) m.set(r.ts_utc, {});
-      m.get(r.ts_utc)[r.series] = r.value;
+      let a = m.get(r.ts_utc);
+      if (!a) m.set(r.ts_utc, (a = new Float64Array(2 * XB_CC.length).fill(NaN)));
+      const k = XB_SLOT.get(r.series.slice(r.series.indexOf('_') + 1));
+      if (k !== undefined) a[k] = r.value;
     }
   }
   const SRC_LABEL = {
@@ -827,18 +886,18 @@ function piPage(date) {
     solar: 'solar', wind_onshore: 'eolian', nuclear: 'nuclear', gas: 'gaz',
     lignite: 'lignit', hard_coal: 'huilă', biomass: 'biomasă', B25: 'stocare', other: 'altele',
   };
-  const xbNet = (m, ts, pfxIn, pfxOut) => {
+  const xbNet = (m, ts) => {
     const v = m.get(ts);
     if (!v) return { net: null, parts: [] };
     let imp = 0, exp = 0;
     const parts = [];
-    for (const cc of ['HU', 'BG', 'RS', 'UA', 'MD']) {
-      const i = v[`${pfxIn}_${cc}_RO`], e = v[`${pfxOut}_RO_${cc}`];
-      if (i !== undefined) imp += i;
-      if (e !== undefined) exp += e;
-      if (i !== undefined || e !== undefined) {
-        const net = (e ?? 0) - (i ?? 0);
-        parts.push(`${cc} ${net >= 0 ? '↑' : '↓'}${Math.round(Math.abs(net))}`);
+    for (let c = 0; c < XB_CC.length; c++) {
+      const i = v[2 * c], e = v[2 * c + 1], hasI = !Number.isNaN(i), hasE = !Number.isNaN(e);
+      if (hasI) imp += i;
+      if (hasE) exp += e;
+      if (hasI || hasE) {
+        const net = (hasE ? e : 0) - (hasI ? i : 0);
+        parts.push(`${XB_CC[c]} ${net >= 0 ? '↑' : '↓'}${Math.round(Math.abs(net))}`);
       }
     }
     return { net: exp - imp, parts };
@@ -965,11 +1024,11 @@ function piPage(date) {
     }
     {
       const arrow = (v) => `${v >= 0 ? '↑' : '↓'}${Math.round(Math.abs(v))}`;
-      const xb = isPast ? xbNet(flowMap, ts, 'flow', 'flow') : xbNet(schedMap, ts, 'sched', 'sched');
+      const xb = isPast ? xbNet(flowMap, ts) : xbNet(schedMap, ts);
       if (xb.net !== null) {
         let schedBr = '';
         if (isPast) {
-          const sc = xbNet(schedMap, ts, 'sched', 'sched');
+          const sc = xbNet(schedMap, ts);
           if (sc.net !== null) schedBr = ` <small class="fc">(${arrow(sc.net)})</small>`;
         }
         xbC = `<span title="${(isPast ? 'physical flows (scheduled)' : 'scheduled') + ' — ' + xb.parts.join(' | ')}">${arrow(xb.net)}</span>${schedBr}`;
@@ -1010,8 +1069,8 @@ function piPage(date) {
       ON x.ts_utc=b.ts_utc AND x.mr=b.run_at
     WHERE b.date_ro=? AND b.qty > 0`).get(date, date).s;
   const extras = `
-    <span class="totalpill r2 ${cum >= 0 ? 'tp-pos' : 'tp-neg'}" title="realized day P&L">${Math.round(cum).toLocaleString('en-US')} RON</span>
-    <span class="pill2 r2" title="model's expected day total at decision time"><small>exp</small> ${expTotal !== null ? Math.round(expTotal).toLocaleString('en-US') : '—'}</span>
+    <span class="totalpill r2 ${cum >= 0 ? 'tp-pos' : 'tp-neg'}" title="realized day P&L">${INT_FMT.format(Math.round(cum))} RON</span>
+    <span class="pill2 r2" title="model's expected day total at decision time"><small>exp</small> ${expTotal !== null ? INT_FMT.format(Math.round(expTotal)) : '—'}</span>
     <span class="pill2 r2" title="locked prediction direction accuracy today"><small>acc</small> ${lockJudged ? Math.round(lockHits / lockJudged * 100) + '%' : '—'}</span>
     ${colPicker('cols-pi', [0, 5, 6, 7, 8])}`; // phone default: CET, Type, Qty, Price, position, P&L
   return `<!DOCTYPE html><html><head><meta charset="utf-8"><meta name="viewport" content="width=device-width,initial-scale=1"><link rel="manifest" href="/manifest.json"><meta name="theme-color" content="#FFF500"><meta name="apple-mobile-web-app-capable" content="yes"><meta name="apple-mobile-web-app-title" content="GAN Trading"><link rel="apple-touch-icon" href="/icon-180.png"><title>PI ${date}</title>${STYLE}</head><body>
@@ -1039,6 +1098,7 @@ const WIDGET_KEY = (() => {
 function widgetData() {
   const cfg = loadConfig();
   const today = roDateIsp(new Date()).date;
+  const sv = daySeries(today, ['damas_est_price_pos', 'damas_est_sys_imbalance', 'pzu_ron', 'da_price']);
   const userBets = new Map(db.prepare('SELECT isp, qty FROM user_bets WHERE date_ro=?').all(today).map((r) => [r.isp, r.qty]));
   let pnl = 0, settled = 0;
   const intervals = [];
@@ -1080,58 +1140,74 @@ function widgetData() {
 // Pure live fetch (independent of the pull job), 55s server-side cache. Renders like the PI
 // page: all 96 intervals chronological, current=yellow ▶, last-settled=green ●, window rails.
 const DAMAS_BASE = 'https://newmarkets.transelectrica.ro/usy-durom-publicreportg01/00121002500000000000000000000100/';
+// concurrent callers of the same upstream feed share ONE in-flight request instead of each missing the cache and
+// fetching it again (a page render and the live polls for the same date regularly land together)
+const inflight = new Map();
+function shared(key, fn) {
+  let p = inflight.get(key);
+  if (!p) { p = fn().finally(() => inflight.delete(key)); inflight.set(key, p); }
+  return p;
+}
 // generic single-report DAMAS fetch (15s cache) — shared by the Predict and PI-learn pages
 const reportCache = {};
 async function liveReport(cmd, date) {
   const key = cmd + '|' + date;
   const c = reportCache[key];
   if (c && Date.now() - c.at < 15000) return c.map; // 15s — near-realtime for the Predict page
+  return shared('report|' + key, () => fetchReport(cmd, date, key, c));
+}
+async function fetchReport(cmd, date, key, c) {
   const from = new Date(new Date(date + 'T00:00:00Z').getTime() - 86400000).toISOString();
   const to = new Date(new Date(date + 'T00:00:00Z').getTime() + 86400000).toISOString();
   const u = new URL(DAMAS_BASE + 'publicReport/' + cmd);
   u.searchParams.set('timeInterval', JSON.stringify({ from, to }));
-  const all = (await (await fetch(u)).json()).itemList || [];
+  // conditional GET: revalidate with the validators from the last response; a 304 reuses the parsed map as-is
+  const hdrs = {};
+  if (c?.etag) hdrs['If-None-Match'] = c.etag;
+  if (c?.lastMod) hdrs['If-Modified-Since'] = c.lastMod;
+  const r = await fetch(u, { headers: hdrs });
+  if (r.status === 304 && c) { c.at = Date.now(); return c.map; }
+  const all = (await r.json()).itemList || [];
   const map = new Map();
-  for (const it of all) { const ri = roDateIsp(new Date(it.timeInterval.from)); if (ri.date === date) map.set(ri.isp, it); }
-  reportCache[key] = { at: Date.now(), map };
+  // the RO day's ISPs are consecutive 15-min slots from its first stamp (dayTimestamps, DST-aware): bucket each item
+  // by offset from that start instead of a full roDateIsp() + Date per item across the 3-day window
+  const day = dayTimestamps(date), t0 = Date.parse(day[0].ts), t1 = t0 + day.length * 900000;
+  for (const it of all) { const ms = Date.parse(it.timeInterval.from); if (ms >= t0 && ms < t1) map.set(Math.floor((ms - t0) / 900000) + 1, it); }
+  reportCache[key] = { at: Date.now(), map, etag: r.headers.get('etag'), lastMod: r.headers.get('last-modified') };
   return map;
 }
 const rnum = (v) => { const n = Number(v); return v !== null && v !== undefined && v !== 'N/A' && Number.isFinite(n) ? n : null; };
+// scheduledExchanges item keys per border, built once: [export leg 'ro<cc>', import leg '<cc>ro']
+const XB_KEYS = ['hu', 'bg', 'rs', 'ua', 'md'].map((p) => ['ro' + p, p + 'ro']);
 
-// ---- Transelectrica live SEN feed (real-time national prod/cons/balance + per-source) ----
-// Hidden Liferay resource endpoint behind the "Stare SEN in timp real" page. Comma/pipe/semicolon
-// delimited: rows split by '|', fields by ';' = time;Consum;AvgConsum;Productie;Sold;Coal;Hydro;
-// Gas;Nuclear;Wind;Solar;Biomass. ~10-min cadence, fresh to the minute, date-range capable.
+// ---- Transelectrica live SEN feed (real-time national prod/cons/balance + per-source) via tool/sen_grafic.js ----
 // Replaces ENTSO-E gen_actual (which lagged ~1h and arrived with incomplete plant types).
+const { senGraficUrl, parseSenGrafic } = require('./sen_grafic');
 const senCache = {};
+const SEN_STALE_MS = 300000;
 async function liveSEN(date, maxAge = 45000) {
   const c = senCache[date];
   // 45s default cache: SEN only updates ~10 min, and the host intermittently 404s server-to-server requests
   // (esp. from cloud egress) — refetching too often just invites failures. Reuse only a NON-EMPTY fresh cache.
   // The live current-interval Real-X-B endpoint passes a shorter maxAge (~20s) to track the current interval.
-  if (c && c.map.size && Date.now() - c.at < maxAge) return c.map;
-  const [y, mo, d] = date.split('-');
-  const pre = '&_SENGrafic_WAR_SENGraficportlet_';
-  const u = 'https://www.transelectrica.ro/widget/web/tel/sen-grafic?p_p_id=SENGrafic_WAR_SENGraficportlet&p_p_lifecycle=2&p_p_state=maximized&p_p_mode=view&p_p_cacheability=cacheLevelPage'
-    + pre + 'random=' + Date.now()
-    + pre + 'start_day=' + (+d) + pre + 'start_month=' + (+mo) + pre + 'start_year=' + y + pre + 'start_Hour=0' + pre + 'start_Minute=0'
-    + pre + 'end_day=' + (+d) + pre + 'end_month=' + (+mo) + pre + 'end_year=' + y + pre + 'end_Hour=23' + pre + 'end_Minute=59';
+  // Stale-while-revalidate: past maxAge but within SEN_STALE_MS, answer with the cached map at once and refresh in
+  // the background — a render never waits on the flaky host's retries for data that moves only every ~10 min.
+  if (c && c.map.size) {
+    const age = Date.now() - c.at;
+    if (age < maxAge) return c.map;
+    if (age < SEN_STALE_MS) { shared('sen|' + date, () => fetchSEN(date, c)).catch(() => {}); return c.map; }
+  }
+  return shared('sen|' + date, () => fetchSEN(date, c));
+}
+async function fetchSEN(date, c) {
+  const u = senGraficUrl(date);
   const HDRS = { 'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/124 Safari/537.36', 'Accept': '*/*', 'X-Requested-With': 'XMLHttpRequest' };
   // Retry the flaky SEN host; NEVER cache an empty result — fall back to last-good so Real columns don't blank.
   for (let attempt = 1; attempt <= 3; attempt++) {
     try {
       const r = await fetch(u, { headers: HDRS });
       if (r.ok) {
-        const t = await r.text();
-        const map = new Map();
-        for (const row of t.split('|')) {
-          const f = row.split(';');
-          if (f.length < 12) continue;
-          const m = /(\d{2})-(\d{2})-(\d{4}) (\d{2}):(\d{2})/.exec(f[0].trim());
-          if (!m) continue;
-          const isp = Math.floor((+m[4] * 60 + +m[5]) / 15) + 1; // RO-local minutes → ISP (last sample wins)
-          map.set(isp, { cons: +f[1], prod: +f[3], sold: +f[4] });
-        }
+        const map = parseSenGrafic(await r.text());
         if (map.size) { senCache[date] = { at: Date.now(), map }; return map; }
       }
     } catch { /* fall through to retry */ }
@@ -1150,11 +1226,17 @@ const signModel = require('./sign_model');
 const resModel = require('./res_model');
 let signCache = { model: null, trainedAt: null, inlineAt: 0 };
 let resCache = { model: null, trainedAt: null, inlineAt: 0 };
+// probe only trained_at on each call; the JSON blob is read + parsed once per new training run
+const _mcStamp = db.prepare('SELECT trained_at FROM model_cache WHERE name=?');
+const _mcJson = db.prepare('SELECT json FROM model_cache WHERE name=? AND trained_at=?');
 function loadModel(name, cache, trainFn) {
   try {
-    const r = db.prepare('SELECT json, trained_at FROM model_cache WHERE name=?').get(name);
+    const r = _mcStamp.get(name);
     if (r && Date.now() - Date.parse(r.trained_at) < 5400000) { // fresh precompute (<90min)
-      if (cache.trainedAt !== r.trained_at) { cache.model = JSON.parse(r.json); cache.trainedAt = r.trained_at; }
+      if (cache.trainedAt !== r.trained_at) {
+        const j = _mcJson.get(name, r.trained_at);
+        if (j) { cache.model = JSON.parse(j.json); cache.trainedAt = r.trained_at; }
+      }
       return cache.model;
     }
   } catch { /* model_cache may not exist yet */ }
@@ -1169,38 +1251,78 @@ function liveRegime(cutoffMs) {
   const cut = new Date(cutoffMs).toISOString();
   const recent = db.prepare("SELECT value FROM series WHERE series='damas_est_sys_imbalance' AND value IS NOT NULL AND ts_utc<=? ORDER BY ts_utc DESC LIMIT ?").all(cut, signModel.FRAC_W);
   if (!recent.length) return null;
-  const e = db.prepare("SELECT value FROM series WHERE series='damas_netting_export' AND value IS NOT NULL AND ts_utc<=? ORDER BY ts_utc DESC LIMIT 1").get(cut);
-  const i = db.prepare("SELECT value FROM series WHERE series='damas_netting_import' AND value IS NOT NULL AND ts_utc<=? ORDER BY ts_utc DESC LIMIT 1").get(cut);
+  const e = _lastAtStmt.get('damas_netting_export', cut);
+  const i = _lastAtStmt.get('damas_netting_import', cut);
   return { persist: recent[0].value, fracsurp: recent.filter((r) => r.value > 0).length / recent.length, netting: e && i ? e.value - i.value : 0 };
 }
 // notif_bal for an upcoming interval = notif_prod − notif_cons − net_export_schedule (the "Notif bal" sign-model
 // feature). Forward schedules keyed by (date_ro, isp); returns null if prod/cons or all cross-border legs are absent.
-const _nbStmt = db.prepare("SELECT series, value FROM series WHERE date_ro=? AND isp=? AND series IN ('damas_notif_prod','damas_notif_cons','sched_RO_HU','sched_RO_BG','sched_RO_RS','sched_RO_UA','sched_RO_MD','sched_HU_RO','sched_BG_RO','sched_RS_RO','sched_UA_RO','sched_MD_RO')");
+// Per-ISP prod/cons and the summed export/import schedule legs come back pre-aggregated from SQL (one row per ISP,
+// not 12 series rows to pivot + sum per border in JS). legs = how many cross-border legs were present.
+const NB_COLS = `isp,
+  MAX(CASE WHEN series='damas_notif_prod' THEN value END) P, MAX(CASE WHEN series='damas_notif_cons' THEN value END) C,
+  TOTAL(CASE WHEN series LIKE 'sched_RO_%' THEN value END) e, TOTAL(CASE WHEN series LIKE 'sched_%_RO' THEN value END) i,
+  COUNT(CASE WHEN series LIKE 'sched_%' THEN 1 END) legs`;
+const NB_SERIES = "('damas_notif_prod','damas_notif_cons','sched_RO_HU','sched_RO_BG','sched_RO_RS','sched_RO_UA','sched_RO_MD','sched_HU_RO','sched_BG_RO','sched_RS_RO','sched_UA_RO','sched_MD_RO')";
+const _nbStmt = db.prepare(`SELECT ${NB_COLS} FROM series WHERE date_ro=? AND isp=? AND series IN ${NB_SERIES} GROUP BY isp`);
 const _nbPi = db.prepare('SELECT commercial FROM xb_pi_snap WHERE date_ro=? AND isp=? AND commercial IS NOT NULL ORDER BY pulled_at DESC LIMIT 1');
-function notifBalFor(date, isp) {
-  const m = {}; try { for (const r of _nbStmt.all(date, isp)) m[r.series] = r.value; } catch { return null; }
-  const P = m.damas_notif_prod, C = m.damas_notif_cons; if (P == null || C == null) return null;
+// coms (optional) = the interval's commercial values asc by pulled_at, already read by the caller — its last
+// non-null entry IS what _nbPi would return, so the lock/panic loops don't hit xb_pi_snap twice per interval.
+function lastCom(coms) { for (let i = coms.length - 1; i >= 0; i--) if (coms[i] != null) return coms[i]; return null; }
+function notifBalFor(date, isp, coms) {
+  let s; try { s = _nbStmt.get(date, isp); } catch { return null; }
+  if (!s || s.P == null || s.C == null) return null;
   // net export: prefer the LIVE PI commercial (= the page's Notif X-B; moves intraday as trades land) so the forecast
   // tracks the cross-border PI; fall back to the day-ahead schedule (same final value) when no PI snapshot exists.
-  let net = null; try { const pi = _nbPi.get(date, isp); if (pi && pi.commercial != null) net = pi.commercial; } catch { /* fall through */ }
-  if (net == null) { let e = 0, i = 0, any = false; for (const b of ['HU', 'BG', 'RS', 'UA', 'MD']) { const ev = m['sched_RO_' + b], iv = m['sched_' + b + '_RO']; if (ev != null) { e += ev; any = true; } if (iv != null) { i += iv; any = true; } } if (!any) return null; net = e - i; }
-  return P - C - net;
+  let net = null;
+  if (coms) net = lastCom(coms);
+  else try { const pi = _nbPi.get(date, isp); if (pi && pi.commercial != null) net = pi.commercial; } catch { /* fall through */ }
+  if (net == null) { if (!s.legs) return null; net = s.e - s.i; }
+  return s.P - s.C - net;
 }
 // Batched Notif bal for a WHOLE day in 2 queries (vs notifBalFor's 2 queries PER interval) — for the hot /api/predict_sign loop.
+// latest-row reads for /api/pulse, prepared once: both are LIMIT seeks from the top of an index
+// (ix_senlive_tsms; the series PK), returning only the columns the nowcast uses
+const _lastImbStmt = db.prepare("SELECT ts_utc, value FROM series WHERE series='damas_est_sys_imbalance' AND value IS NOT NULL ORDER BY ts_utc DESC LIMIT 1");
+let _pulseStmt = null; // sen_live is created by the SEN capture, so prepare on first use
+// LIVE system-state nowcast from the freshest SCADA (sen_live table → no extra source load): dev = sold − plan
+// (physical exchange vs plan) reads the settled imbalance at ~0.54 / 80% sign — import OVER plan → DEFICIT lean.
+// ~1-min fresh. Plus the latest settled imbalance as the anchor + a TURN flag when the live read disagrees with it.
+// Situational awareness + early-flip detection, NOT a 75-min forecast edge (validated: persistence still wins the anchor).
+// Served by /api/pulse and piggybacked on /api/predict_sign?pulse=1 (the Predict page's one 10s poll).
+function pulseNow() {
+  _pulseStmt = _pulseStmt || db.prepare('SELECT ts_ms, pulled_at, sold, plan FROM sen_live WHERE sold IS NOT NULL AND plan IS NOT NULL ORDER BY ts_ms DESC LIMIT 30');
+  const recent = _pulseStmt.all();
+  if (!recent.length) return { ok: false };
+  const cur = recent[0], dev = cur.sold - cur.plan;       // ts_ms carries a +3h local-as-UTC offset (relative diffs ok); age uses pulled_at (true UTC)
+  const older = recent.find((r) => r.ts_ms <= cur.ts_ms - 10 * 60000);
+  const trend = older ? dev - (older.sold - older.plan) : null;       // rising dev = deficit deepening
+  const im = _lastImbStmt.get();
+  const anchor = im ? im.value : null;
+  const scadaSign = Math.abs(dev) < 25 ? '' : (dev > 0 ? 'D' : 'S');   // dev>0 = importing over plan = deficit lean
+  const anchorSign = anchor == null || Math.abs(anchor) < 10 ? '' : (anchor > 0 ? 'S' : 'D');
+  return { ok: true, ageS: Math.max(0, Math.round((Date.now() - Date.parse(cur.pulled_at)) / 1000)), dev: Math.round(dev), trend: trend == null ? null : Math.round(trend), scadaSign, anchor: anchor == null ? null : Math.round(anchor), anchorSign, anchorAgeMin: im ? Math.round((Date.now() - Date.parse(im.ts_utc)) / 60000) : null, turn: !!(scadaSign && anchorSign && scadaSign !== anchorSign) };
+}
+// /api/sign_score: the day's locks + the settled imbalance per interval, compiled once instead of per request
+const _imbAtStmt = db.prepare("SELECT value FROM series WHERE series='damas_est_sys_imbalance' AND date_ro=? AND isp=?");
+let _locksStmt = null; // sign_lock is created further down, so prepare on first use
+// /api/res_score: hourly mean per RES series (key = 'YYYY-MM-DDTHH', as ts_utc.slice(0, 13))
+const _resHourStmt = db.prepare(`SELECT series, substr(ts_utc, 1, 13) h, AVG(value) v FROM series
+  WHERE series IN ('gen_actual_solar','gen_actual_wind_onshore','ws_fc_cur_solar','ws_fc_cur_wind_onshore')
+    AND ts_utc>=? AND ts_utc<? AND value IS NOT NULL GROUP BY series, h`);
 function notifBalMapFor(date) {
-  const byIsp = {};
-  try { for (const r of _nbStmt2.all(date)) (byIsp[r.isp] || (byIsp[r.isp] = {}))[r.series] = r.value; } catch { return new Map(); }
+  let rows; try { rows = _nbStmt2.all(date); } catch { return new Map(); }
   const com = {}; try { for (const r of _nbPi2.all(date)) com[r.isp] = r.commercial; } catch { /* ignore */ } // last row per isp (asc) = latest commercial
   const out = new Map();
-  for (const isp of Object.keys(byIsp)) {
-    const s = byIsp[isp]; const P = s.damas_notif_prod, C = s.damas_notif_cons; if (P == null || C == null) continue;
-    let net = com[isp];
-    if (net == null) { let e = 0, i = 0, any = false; for (const b of ['HU', 'BG', 'RS', 'UA', 'MD']) { const ev = s['sched_RO_' + b], iv = s['sched_' + b + '_RO']; if (ev != null) { e += ev; any = true; } if (iv != null) { i += iv; any = true; } } if (!any) continue; net = e - i; }
-    out.set(+isp, P - C - net);
+  for (const s of rows) {
+    if (s.P == null || s.C == null) continue;
+    let net = com[s.isp];
+    if (net == null) { if (!s.legs) continue; net = s.e - s.i; }
+    out.set(s.isp, s.P - s.C - net);
   }
   return out;
 }
-const _nbStmt2 = db.prepare("SELECT isp, series, value FROM series WHERE date_ro=? AND series IN ('damas_notif_prod','damas_notif_cons','sched_RO_HU','sched_RO_BG','sched_RO_RS','sched_RO_UA','sched_RO_MD','sched_HU_RO','sched_BG_RO','sched_RS_RO','sched_UA_RO','sched_MD_RO')");
+const _nbStmt2 = db.prepare(`SELECT ${NB_COLS} FROM series WHERE date_ro=? AND series IN ${NB_SERIES} GROUP BY isp`);
 const _nbPi2 = db.prepare('SELECT isp, commercial FROM xb_pi_snap WHERE date_ro=? AND commercial IS NOT NULL ORDER BY isp, pulled_at');
 // LOCK the forecast at gate-close: the CURRENT TRADEABLE interval (the gate row = start ≥ current-ISP-start + 75min)
 // stays LIVE; once the gate advances past it (it becomes ISP+4, untradeable) its prediction freezes + is RECORDED
@@ -1214,7 +1336,7 @@ try { db.exec('CREATE TABLE IF NOT EXISTS panic_log(date_ro TEXT, isp INTEGER, f
 function lockDueForecasts() {
   const model = getSignModel(); if (!model) return;
   const nowMs = Date.now(); const ni = roDateIsp(new Date());
-  const curTs = dayTimestamps(ni.date).find((t) => t.isp === ni.isp); if (!curTs) return;
+  const curTs = ispTs(ni.date, ni.isp); if (!curTs) return;
   const gateMs = new Date(curTs.ts).getTime() + 75 * signModel.MIN; // first TRADEABLE delivery start (= current-ISP start + 75min), matches the trade-gate
   const reg = liveRegime(nowMs - signModel.PUB_LAG * signModel.MIN); if (!reg) return; const persist = reg.persist;
   const has = db.prepare('SELECT 1 FROM sign_lock WHERE date_ro=? AND isp=?');
@@ -1225,9 +1347,9 @@ function lockDueForecasts() {
     const Tms = new Date(ts).getTime();
     if (Tms >= gateMs || Tms < gateMs - 15 * signModel.MIN) continue; // lock ONLY the interval that JUST became untradeable (old gate row → ISP+4): gate−15min ≤ start < gate. The gate row (≥ gate) stays live.
     if (has.get(ni.date, isp)) continue;                 // lock once
-    let pi_move = 0; try { const fr = piStmt.all(ni.date, isp); if (fr.length >= 2) pi_move = fr[fr.length - 1].commercial - fr[0].commercial; } catch { /* ignore */ }
+    let pi_move = 0, coms; try { const fr = piStmt.all(ni.date, isp); coms = fr.map((f) => f.commercial); if (fr.length >= 2) pi_move = fr[fr.length - 1].commercial - fr[0].commercial; } catch { /* ignore */ }
     const lead = (Tms - nowMs) / signModel.MIN;
-    const p = signModel.prob(model, persist, pi_move, reg.fracsurp, reg.netting, notifBalFor(ni.date, isp), isp, lead);
+    const p = signModel.prob(model, persist, pi_move, reg.fracsurp, reg.netting, notifBalFor(ni.date, isp, coms), isp, lead);
     ins.run(ni.date, isp, +p.toFixed(4), p >= 0.5 ? 'S' : 'D', Math.round(Math.max(p, 1 - p) * 100), new Date().toISOString());
   }
 }
@@ -1239,7 +1361,7 @@ function recentMove(frames, nowMs) { if (frames.length < 2) return 0; const last
 function detectPanics() {
   const model = getSignModel(); if (!model) return;
   const nowMs = Date.now(); const ni = roDateIsp(new Date());
-  const curTs = dayTimestamps(ni.date).find((t) => t.isp === ni.isp); if (!curTs) return;
+  const curTs = ispTs(ni.date, ni.isp); if (!curTs) return;
   const gateMs = new Date(curTs.ts).getTime() + 75 * signModel.MIN;
   const reg = liveRegime(nowMs - signModel.PUB_LAG * signModel.MIN); if (!reg) return;
   const persistDir = reg.persist > 0 ? 'S' : 'D';
@@ -1255,7 +1377,7 @@ function detectPanics() {
     const burst = recentMove(frames, nowMs); const pa = Math.abs(burst); if (pa < PANIC_MW) continue;
     const pi_move = frames[frames.length - 1].c - frames[0].c; // cumulative repositioning — feeds the model prob
     const lead = (Tms - nowMs) / signModel.MIN;
-    const p = signModel.prob(model, reg.persist, pi_move, reg.fracsurp, reg.netting, notifBalFor(ni.date, isp), isp, lead);
+    const p = signModel.prob(model, reg.persist, pi_move, reg.fracsurp, reg.netting, notifBalFor(ni.date, isp, frames.map((f) => f.c)), isp, lead);
     const piDir = burst > 0 ? 'S' : 'D'; const opposes = piDir !== persistDir ? 1 : 0;
     const ex = sel.get(ni.date, isp);
     if (!ex) ins.run(ni.date, isp, new Date().toISOString(), burst, pa, reg.persist, +p.toFixed(4), piDir, persistDir, opposes);
@@ -1265,25 +1387,31 @@ function detectPanics() {
 // Lock the realized surplus/deficit outcome onto logged panic events once the interval settles → builds the scored
 // dataset to test whether big PI moves predict flips (vs persistence) or merely confirm the state.
 function scorePanics() {
-  const rows = db.prepare('SELECT date_ro, isp FROM panic_log WHERE realized_dir IS NULL').all(); if (!rows.length) return;
+  // realized sign for every still-open panic in ONE join (series is indexed on (series, date_ro, isp)) — no
+  // per-row lookup; intervals not yet settled simply don't join and stay open for the next pass
+  const rows = db.prepare(`SELECT p.date_ro, p.isp, s.value FROM panic_log p CROSS JOIN series s -- CROSS: keep panic_log outer
+    ON s.series='damas_est_sys_imbalance' AND s.date_ro=p.date_ro AND s.isp=p.isp
+    WHERE p.realized_dir IS NULL`).all(); if (!rows.length) return;
   const set = db.prepare('UPDATE panic_log SET realized_dir=?, scored_at=? WHERE date_ro=? AND isp=?');
-  for (const r of rows) {
-    const t = dayTimestamps(r.date_ro).find((x) => x.isp === r.isp); if (!t) continue;
-    const Tms = new Date(t.ts).getTime();
-    const v = db.prepare("SELECT value FROM series WHERE series='damas_est_sys_imbalance' AND value IS NOT NULL AND ts_utc>=? AND ts_utc<? LIMIT 1").get(new Date(Tms).toISOString(), new Date(Tms + 60000).toISOString());
-    if (v) set.run(v.value > 0 ? 'S' : 'D', new Date().toISOString(), r.date_ro, r.isp);
-  }
+  const now = new Date().toISOString();
+  db.exec('BEGIN');
+  try { for (const r of rows) set.run(r.value > 0 ? 'S' : 'D', now, r.date_ro, r.isp); db.exec('COMMIT'); } catch (e) { db.exec('ROLLBACK'); throw e; }
 }
-setInterval(() => { try { lockDueForecasts(); detectPanics(); scorePanics(); } catch (e) { console.error('sign loop:', e.message); } }, 60000);
-try { lockDueForecasts(); detectPanics(); scorePanics(); } catch (e) { /* ignore at startup */ }
-// index for per-hour weather lookups (weather PK starts with `point`, so ts_utc filters were full scans ~230ms)
-try { db.exec('CREATE INDEX IF NOT EXISTS ix_weather_ts ON weather(ts_utc)'); } catch (e) { /* table may not exist yet */ }
+// each step caught on its own (message only): one failing no longer skips the rest of the tick
+const SIGN_STEPS = [['lock', lockDueForecasts], ['panics', detectPanics], ['score', scorePanics]];
+function signLoop(quiet) { for (const [name, fn] of SIGN_STEPS) { try { fn(); } catch (e) { if (!quiet) console.error(`sign loop (${name}):`, e.message); } } }
+setInterval(() => signLoop(false), 60000);
+// first pass deferred past module load: it can train a model inline (cold model_cache), which would otherwise hold
+// up server.listen() and the health check — now the socket is bound first and the pass runs right after
+setImmediate(() => signLoop(true)); // quiet at startup
 let senFilterCache = { at: 0, data: null };
 async function liveSenFilter(maxAge = 10000) {
   if (senFilterCache.data && Date.now() - senFilterCache.at < maxAge) return senFilterCache.data;
-  const d = await senFilter.fetchSenFilter().catch(() => null);
-  if (d) { senFilterCache = { at: Date.now(), data: d }; try { senFilter.record(db, d, roDateIsp); } catch (e) { console.error('sen_live record:', e.message); } return d; }
-  return senFilterCache.data;
+  return shared('senfilter', async () => {
+    const d = await senFilter.fetchSenFilter().catch(() => null);
+    if (d) { senFilterCache = { at: Date.now(), data: d }; try { senFilter.record(db, d, roDateIsp); } catch (e) { console.error('sen_live record:', e.message); } return d; }
+    return senFilterCache.data;
+  });
 }
 
 // interval time-weighted average net export — delegates to the CANONICAL impl in sen_filter.js (single source
@@ -1337,15 +1465,20 @@ function pzuForecast(date) {
 }
 
 // ---- Predict page: trader-facing real-vs-notified view (imbalance, prod, cons, cross-border) ----
+// the DAMAS reports the Predict page renders from, in destructuring order (also pre-warmed at startup)
+const PREDICT_REPORTS = ['estimatedImbalancePrices', 'estimatedPowerSystemImbalance', 'generationSchedules', 'dailyConsumptionOverview', 'scheduledExchanges'];
 async function predictPage(date) {
-  const SEN = await liveSEN(date).catch(() => new Map());
+  // the live sources are independent network fetches: start them together so the page waits for the slowest one,
+  // not the sum (SENGrafic, the 5 DAMAS reports, and — for today only — the sen-filter homepage feed)
+  const isToday = roDateIsp(new Date()).date === date;
+  const [SEN, P, E, G, C, X, SF] = await Promise.all([
+    liveSEN(date).catch(() => new Map()),
+    ...PREDICT_REPORTS.map((c) => liveReport(c, date).catch(() => new Map())),
+    isToday ? liveSenFilter().catch(() => null) : null,
+  ]);
   // per-interval SCADA generation mix (avg over the interval's sen_live readings) → the prod split on SETTLED rows
   const senMix = new Map();
   try { for (const r of db.prepare("SELECT isp, AVG(solar) so, AVG(wind) wi, AVG(hydro) hy, AVG(nuclear) nu FROM sen_live WHERE date_ro=? AND solar IS NOT NULL GROUP BY isp").all(date)) senMix.set(r.isp, { solar: r.so, wind: r.wi, hydro: r.hy, nuclear: r.nu }); } catch { /* sen_live may be absent */ }
-  const [P, E, G, C, X] = await Promise.all(
-    ['estimatedImbalancePrices', 'estimatedPowerSystemImbalance', 'generationSchedules', 'dailyConsumptionOverview', 'scheduledExchanges']
-      .map((c) => liveReport(c, date).catch(() => new Map())),
-  );
   const cfg = loadConfig(); const [wh0, wh1] = cfg.trade_window_cet || [7, 22];
   const winFrom = (wh0 + 1) * 4 + 1, winTo = (wh1 + 1) * 4 + 1; // +1 → include the wh1:00-starting row (e.g. 22:00)
   const nowInfo = roDateIsp(new Date()); const nowMs = Date.now();
@@ -1354,7 +1487,7 @@ async function predictPage(date) {
   // each ISP). Per-row state by absolute time so it's date-general: past (before the current ISP) / locked (current ISP
   // through the gate) / open (≥ gate). gate = (start of current ISP) + 75 min = first tradeable delivery start.
   const LOCK_LEAD_MIN = 75;
-  const curIspTs = dayTimestamps(nowInfo.date).find((t) => t.isp === nowInfo.isp);
+  const curIspTs = ispTs(nowInfo.date, nowInfo.isp);
   const curIspStartMs = curIspTs ? new Date(curIspTs.ts).getTime() : nowMs;
   const gateMs = curIspStartMs + LOCK_LEAD_MIN * 60000;
   const firstOpenIsp = nowInfo.isp + LOCK_LEAD_MIN / 15; // current ISP + 5
@@ -1363,10 +1496,10 @@ async function predictPage(date) {
     ? `<b>Trade gate</b> · ${LOCK_LEAD_MIN}-min lead — <span class="op">▶ trade window opens at ${gateCet}</span>, locks in <span class="ivtimer" data-end="${curIspStartMs + 900000}">–:––</span> · <span class="lk">🔒 nearer intervals locked</span> · <span style="opacity:.6">grey = delivered</span>`
     : (date < nowInfo.date ? '<b>Past day</b> — all intervals delivered' : '<b>Future day</b> — all intervals open to trade');
   const schedVal = (o) => { if (!o || typeof o !== 'object') return null; let v = rnum(o.commercial); if (v === null) { const da = rnum(o.dayAhead), id = rnum(o.intraday); if (da !== null || id !== null) v = (da ?? 0) + (id ?? 0); } return v; };
-  const notifXB = (x) => { if (!x) return null; let net = 0, any = false; for (const p of ['hu', 'bg', 'rs', 'ua', 'md']) { const e = schedVal(x['ro' + p]), i = schedVal(x[p + 'ro']); if (e !== null) { net += e; any = true; } if (i !== null) { net -= i; any = true; } } return any ? net : null; };
+  const notifXB = (x) => { if (!x) return null; let net = 0, any = false; for (const [ek, ik] of XB_KEYS) { const e = schedVal(x[ek]), i = schedVal(x[ik]); if (e !== null) { net += e; any = true; } if (i !== null) { net -= i; any = true; } } return any ? net : null; };
   // net cross-border (export − import) using a SPECIFIC schedule component (dayAhead | intraday)
-  const xbBy = (x, field) => { if (!x) return null; let net = 0, any = false; for (const p of ['hu', 'bg', 'rs', 'ua', 'md']) { const eo = x['ro' + p], io = x[p + 'ro']; const e = eo ? rnum(eo[field]) : null, i = io ? rnum(io[field]) : null; if (e !== null) { net += e; any = true; } if (i !== null) { net -= i; any = true; } } return any ? net : null; };
-  const fmt = (v) => (v === null || v === undefined ? '' : Math.round(v).toLocaleString('en-US'));
+  const xbBy = (x, field) => { if (!x) return null; let net = 0, any = false; for (const [ek, ik] of XB_KEYS) { const eo = x[ek], io = x[ik]; const e = eo ? rnum(eo[field]) : null, i = io ? rnum(io[field]) : null; if (e !== null) { net += e; any = true; } if (i !== null) { net -= i; any = true; } } return any ? net : null; };
+  const fmt = (v) => (v === null || v === undefined ? '' : INT_FMT.format(Math.round(v)));
   const dlt = (v) => (v === null ? '' : `<span class="${v >= 0 ? 'pos' : 'neg'}">${v >= 0 ? '+' : ''}${Math.round(v)}</span>`);
   // forecast deviation cell (upcoming): forecast Real − Notif, shown italic to mark it's a forecast not a measured delta
   const dltF = (v, tip) => (v === null ? '' : `<span style="font-style:italic;opacity:.7" title="${tip}"><span class="${v >= 0 ? 'pos' : 'neg'}">${v >= 0 ? '+' : ''}${Math.round(v)}</span></span>`);
@@ -1447,9 +1580,8 @@ async function predictPage(date) {
   // is sampled (~10-min feed). Used for the current interval's Real X-B cell so it matches the homepage exactly.
   let latestSold = null;
   if (nowInfo.date === date) for (let k = nowInfo.isp; k >= Math.max(1, nowInfo.isp - 8); k--) { const s = SEN.get(k); if (s && Number.isFinite(s.sold)) { latestSold = s.sold; break; } }
-  // live homepage feed (sen-filter, ~10s) — SOLD + PLAN, both from transelectrica (no DAMAS). Falls back to
-  // the SENGrafic latest sample if the feed is momentarily down.
-  const SF = nowInfo.date === date ? await liveSenFilter().catch(() => null) : null;
+  // live homepage feed (sen-filter, ~10s; SF, fetched above) — SOLD + PLAN, both from transelectrica (no DAMAS). Falls
+  // back to the SENGrafic latest sample if the feed is momentarily down.
   const liveSold = SF && SF.sold !== null ? SF.sold : latestSold;
   const liveNotif = SF && SF.plan !== null ? -SF.plan : null; // Notif X-B (net export) = −PLAN
   const liveProd = SF && SF.prod != null ? SF.prod : null; // live Transelectrica SCADA national generation (for the live row)
@@ -1457,7 +1589,7 @@ async function predictPage(date) {
   const liveSolar = SF ? SF.solar : null, liveWind = SF ? SF.wind : null, liveHydro = SF ? SF.hydro : null, liveNuclear = SF ? SF.nuclear : null; // live SCADA generation mix (for the live-row prod split)
   // the interval the live reading belongs to per its SCADA timestamp (lags the wall-clock interval by the feed
   // delay) — the live value/colour/avg go in THIS row, not the wall-clock current one, until the SCADA clock reaches it.
-  const liveSi = SF && SF.ts ? senFilter.tsInterval(SF.ts) : null;
+  const liveSi = SF ? SF.si : null;
   const liveIsp = nowInfo.date === date ? (liveSi && liveSi.date === date ? liveSi.isp : nowInfo.isp) : -1;
   // interval average (net export, time-weighted) of the sen_live readings in the live (SCADA-time) interval
   let liveAvg = null, liveAvgN = 0;
@@ -1615,9 +1747,15 @@ ${body}</table></div>
 <script>(function(){
   // Near-realtime partial refresh: re-fetch this page, swap ONLY the table body in place (no full
   // reload → no flash, scroll kept), and re-apply the colPicker column hiding to the fresh cells.
-  var POLL=15000;
+  // Failed polls back off (15s → 30s → … capped at 2 min) instead of re-rendering at a fixed rate against a down
+  // host; a hidden tab skips the render entirely and catches up the moment it becomes visible again.
+  var POLL=15000, delay=POLL, timer=0, busy=false;
   function dot(c){var d=document.getElementById('rtdot');if(d)d.style.color=c;}
+  function schedule(ms){clearTimeout(timer);timer=setTimeout(tick,ms);}
   function tick(){
+    if(busy)return;
+    if(document.hidden){schedule(POLL);return;}
+    busy=true;
     fetch(location.href,{cache:'no-store',headers:{'X-Requested-With':'rt'}})
       .then(function(r){if(!r.ok)throw 0;return r.text();})
       .then(function(html){
@@ -1641,11 +1779,13 @@ ${body}</table></div>
         }
         var el=document.getElementById('rtstamp');if(el)el.textContent=new Date().toLocaleTimeString();
         dot('#1a9e57');
+        delay=POLL;
       })
-      .catch(function(){dot('#d2691e');})
-      .finally(function(){setTimeout(tick,POLL);}); // self-paced: next poll 15s AFTER this one finishes
+      .catch(function(){dot('#d2691e');delay=Math.min(120000,delay*2);})
+      .finally(function(){busy=false;schedule(delay);}); // self-paced: next poll AFTER this one finishes
   }
-  setTimeout(tick,POLL);
+  document.addEventListener('visibilitychange',function(){if(!document.hidden)schedule(0);});
+  schedule(POLL);
 })();</script>
 <script>(function(){
   // LIVE current-interval Real X-B tracker (Transelectrica Sold). Updates ONLY the current interval's Real X-B
@@ -1721,7 +1861,9 @@ ${body}</table></div>
   // (and right after the 15s table swap). Fuses persistence + time-of-day + PI order-flow (see sign_model.js).
   var DATE=${JSON.stringify(date)};
   function paint(){
-    fetch('/api/predict_sign?date='+DATE,{cache:'no-store'}).then(function(r){return r.json();}).then(function(j){
+    // one request carries both the sign forecasts and the live pulse (was two separate 10s polls)
+    fetch('/api/predict_sign?date='+DATE+'&pulse=1',{cache:'no-store'}).then(function(r){return r.json();}).then(function(j){
+      if(j.pulse&&window.__paintPulse)window.__paintPulse(j.pulse);
       var by={}; (j.rows||[]).forEach(function(r){by[r.isp]=r;});
       document.querySelectorAll('.fc-imb').forEach(function(el){
         var r=by[el.dataset.fc];
@@ -1738,19 +1880,16 @@ ${body}</table></div>
 })();</script>
 <script>(function(){
   function lbl(s){return s==='S'?'surplus':s==='D'?'deficit':'balanced';}
-  function paint(){
-    fetch('/api/pulse',{cache:'no-store'}).then(function(r){return r.json();}).then(function(j){
-      var el=document.getElementById('pulsebar'); if(!el)return; if(!j.ok){el.style.display='none';return;}
-      el.style.display='block';
-      var col=j.scadaSign==='S'?'#1a9e57':j.scadaSign==='D'?'#d83a3a':'var(--fg-muted)';
-      var devTxt=Math.abs(j.dev)+' MW '+(j.dev>0?'over':'under')+' plan';
-      var trend=''; if(j.trend!=null&&j.scadaSign){var deepening=(j.trend>0)===(j.dev>0);trend=' · '+(Math.abs(j.trend)<15?'steady':(deepening?'deepening':'easing'));}
-      var anchorTxt=j.anchorSign?('last settled '+lbl(j.anchorSign)+' '+Math.abs(j.anchor)+' ('+j.anchorAgeMin+'m ago)'):'no recent settled value';
-      var turn=j.turn?' · <b style="color:#c8860a">⚠ disagrees with last settled — possible turn to '+lbl(j.scadaSign)+'</b>':'';
-      el.innerHTML='<b>⚡ Live pulse</b> <small style="color:var(--fg-muted)">('+j.ageS+'s ago, SCADA)</small> · <b style="color:'+col+'">'+lbl(j.scadaSign).toUpperCase()+'</b> lean <small style="color:var(--fg-muted)">('+devTxt+trend+')</small> · <small style="color:var(--fg-muted)">'+anchorTxt+'</small>'+turn;
-    }).catch(function(){});
-  }
-  setInterval(paint,10000); setTimeout(paint,1000);
+  window.__paintPulse=function(j){ // fed by the sign-forecast poll (/api/predict_sign?pulse=1)
+    var el=document.getElementById('pulsebar'); if(!el)return; if(!j.ok){el.style.display='none';return;}
+    el.style.display='block';
+    var col=j.scadaSign==='S'?'#1a9e57':j.scadaSign==='D'?'#d83a3a':'var(--fg-muted)';
+    var devTxt=Math.abs(j.dev)+' MW '+(j.dev>0?'over':'under')+' plan';
+    var trend=''; if(j.trend!=null&&j.scadaSign){var deepening=(j.trend>0)===(j.dev>0);trend=' · '+(Math.abs(j.trend)<15?'steady':(deepening?'deepening':'easing'));}
+    var anchorTxt=j.anchorSign?('last settled '+lbl(j.anchorSign)+' '+Math.abs(j.anchor)+' ('+j.anchorAgeMin+'m ago)'):'no recent settled value';
+    var turn=j.turn?' · <b style="color:#c8860a">⚠ disagrees with last settled — possible turn to '+lbl(j.scadaSign)+'</b>':'';
+    el.innerHTML='<b>⚡ Live pulse</b> <small style="color:var(--fg-muted)">('+j.ageS+'s ago, SCADA)</small> · <b style="color:'+col+'">'+lbl(j.scadaSign).toUpperCase()+'</b> lean <small style="color:var(--fg-muted)">('+devTxt+trend+')</small> · <small style="color:var(--fg-muted)">'+anchorTxt+'</small>'+turn;
+  };
 })();</script>
 <script>(function(){
   // SELF-CHECK scorecard: how the model's LOCKED forecasts did vs realized TODAY + the trailing miss streak.
@@ -1805,20 +1944,24 @@ ${body}</table></div>
 </body></html>`;
 }
 
-function readBody(req) {
+// request body as raw bytes: chunks kept as Buffers and decoded once at the end (string += per chunk copies the
+// growing body each time and can split a multi-byte UTF-8 char across chunk boundaries)
+function readRaw(req) {
   return new Promise((resolve) => {
-    let b = '';
-    req.on('data', (c) => (b += c));
-    req.on('end', () => { try { resolve(JSON.parse(b || '{}')); } catch { resolve({}); } });
+    const chunks = [];
+    req.on('data', (c) => chunks.push(c));
+    req.on('end', () => resolve(Buffer.concat(chunks).toString('utf8')));
+    req.on('error', () => resolve(''));
   });
 }
 
-function readForm(req) {
-  return new Promise((resolve) => {
-    let b = '';
-    req.on('data', (c) => (b += c));
-    req.on('end', () => resolve(Object.fromEntries(new URLSearchParams(b))));
-  });
+async function readBody(req) {
+  const b = await readRaw(req);
+  try { return JSON.parse(b || '{}'); } catch { return {}; }
+}
+
+async function readForm(req) {
+  return Object.fromEntries(new URLSearchParams(await readRaw(req)));
 }
 
 // ---- auth: named users from USERS env ("ana:pw1,ion:pw2"), HMAC-signed session cookie ----
@@ -1865,11 +2008,9 @@ async function piLearnPage(date, frameTs) {
   date = date || roDateIsp(new Date()).date;
   const today = roDateIsp(new Date()).date;
   const nowMs = Date.now(); const nowInfo = roDateIsp(new Date());
-  const [P, X] = await Promise.all([liveReport('estimatedImbalancePrices', date).catch(() => new Map()), liveReport('scheduledExchanges', date).catch(() => new Map())]);
-  const SEN = await liveSEN(date).catch(() => new Map());
+  const [P, X, SEN] = await Promise.all([liveReport('estimatedImbalancePrices', date).catch(() => new Map()), liveReport('scheduledExchanges', date).catch(() => new Map()), liveSEN(date).catch(() => new Map())]);
   const xbAgg = xbDeltaAgg(date); // recorded X-B Δ snapshots → interval-average + drift
-  const bd = ['hu', 'bg', 'rs', 'ua', 'md'];
-  const netComm = (x) => { if (!x) return null; let n = 0, any = false; for (const p of bd) { const eo = x['ro' + p], io = x[p + 'ro']; const e = eo ? rnum(eo.commercial) : null, i = io ? rnum(io.commercial) : null; if (e !== null) { n += e; any = true; } if (i !== null) { n -= i; any = true; } } return any ? n : null; };
+  const netComm = (x) => { if (!x) return null; let n = 0, any = false; for (const [ek, ik] of XB_KEYS) { const eo = x[ek], io = x[ik]; const e = eo ? rnum(eo.commercial) : null, i = io ? rnum(io.commercial) : null; if (e !== null) { n += e; any = true; } if (i !== null) { n -= i; any = true; } } return any ? n : null; };
   const arrow = (v) => (v === null ? '' : `${v >= 0 ? '↑' : '↓'}${Math.round(Math.abs(v))}`);
   const dlt = (v) => (v === null ? '' : `<span class="${v >= 0 ? 'pos' : 'neg'}">${v >= 0 ? '+' : ''}${Math.round(v)}</span>`);
   let lastRealIsp = null;
@@ -1899,19 +2040,23 @@ async function piLearnPage(date, frameTs) {
   if (frameTs) {
     let frames = [], realized = null;
     try { frames = db.prepare('SELECT pulled_at, d1, pi, lt, commercial FROM xb_pi_snap WHERE ts_utc=? ORDER BY pulled_at').all(frameTs); } catch {}
-    try { const rr = db.prepare("SELECT value FROM series WHERE series='damas_est_sys_imbalance' AND ts_utc=?").get(frameTs); realized = rr ? rr.value : null; } catch {}
+    realized = sv('damas_est_sys_imbalance', frameTs);
     // grid state at each frame's pull time: system imbalance + net commercial X-B of the interval being delivered then
     const imbMap = new Map(), sxNet = new Map();
     if (frames.length) {
       const fromIso = new Date(new Date(frames[0].pulled_at).getTime() - 3600000).toISOString();
-      try { for (const r of db.prepare("SELECT ts_utc, value FROM series WHERE series='damas_est_sys_imbalance' AND ts_utc >= ?").all(fromIso)) imbMap.set(r.ts_utc, r.value); } catch {}
-      try { const EXP = new Set(['damas_sx_rohu', 'damas_sx_robg', 'damas_sx_rors', 'damas_sx_roua', 'damas_sx_romd']); for (const r of db.prepare("SELECT ts_utc, series, value FROM series WHERE series LIKE 'damas_sx_%' AND ts_utc >= ?").all(fromIso)) sxNet.set(r.ts_utc, (sxNet.get(r.ts_utc) || 0) + (EXP.has(r.series) ? r.value : -r.value)); } catch {}
+      try { for (const r of db.prepare("SELECT ts_utc, value FROM series WHERE series='damas_est_sys_imbalance' AND ts_utc >= ? ORDER BY ts_utc").iterate(fromIso)) imbMap.set(r.ts_utc, r.value); } catch {}
+      // net commercial X-B per interval summed in SQL: RO→neighbour legs count +, every other damas_sx_* leg −
+      try {
+        for (const r of db.prepare(`SELECT ts_utc, SUM(CASE WHEN series IN ('damas_sx_rohu','damas_sx_robg','damas_sx_rors','damas_sx_roua','damas_sx_romd')
+            THEN value ELSE -value END) net FROM series WHERE series LIKE 'damas_sx_%' AND ts_utc >= ? GROUP BY ts_utc ORDER BY ts_utc`).iterate(fromIso)) sxNet.set(r.ts_utc, r.net);
+      } catch {}
     }
     const gridTs = (pms) => new Date(Math.floor(pms / 900000) * 900000).toISOString().slice(0, 19) + '.000Z';
-    const imbSorted = [...imbMap.entries()].map(([k, v]) => [Date.parse(k), v]).sort((a, b) => a[0] - b[0]);
-    const sxSorted = [...sxNet.entries()].map(([k, v]) => [Date.parse(k), v]).sort((a, b) => a[0] - b[0]);
+    const imbSorted = [...imbMap.entries()].map(([k, v]) => [Date.parse(k), v]); // PK order = time order, no sort
+    const sxSorted = [...sxNet.entries()].map(([k, v]) => [Date.parse(k), v]); // already in time order (ORDER BY ts_utc)
     const latestLE = (arr, t) => { let r = null; for (const e of arr) { if (e[0] <= t) r = e[1]; else break; } return r; }; // freshest value as-known at t (handles settlement lag)
-    const cetClock = (iso) => new Date(iso).toLocaleTimeString('en-GB', { timeZone: 'Europe/Berlin', hour: '2-digit', minute: '2-digit', second: '2-digit', hour12: false }); // real pull time in CET
+    const cetClock = (iso) => CET_HMS.format(new Date(iso)); // real pull time in CET
     let pPi = null;
     const fr = frames.map((f) => {
       const dpi = pPi == null ? '' : (f.pi - pPi >= 0 ? '+' : '') + Math.round(f.pi - pPi); pPi = f.pi;
@@ -1929,10 +2074,13 @@ async function piLearnPage(date, frameTs) {
   {
     let comboTxt = 'combo intraday (paper): warming up', plTxt = '';
     try {
-      const ci = db.prepare("SELECT COUNT(*) n, AVG(model_correct)*100 acc, AVG(persist_correct)*100 pacc, SUM(pnl_ron) pnl, SUM(ABS(qty)) mwh FROM combo_pred WHERE kind='intraday' AND realized_imb IS NOT NULL").get();
-      const pend = db.prepare("SELECT COUNT(*) n FROM combo_pred WHERE kind='intraday' AND realized_imb IS NULL").get();
+      // settled score + pending count in one pass over the intraday rows (settled = realized_imb present)
+      const ci = db.prepare(`SELECT COUNT(realized_imb) n, COUNT(*) - COUNT(realized_imb) pend,
+        AVG(CASE WHEN realized_imb IS NOT NULL THEN model_correct END)*100 acc, AVG(CASE WHEN realized_imb IS NOT NULL THEN persist_correct END)*100 pacc,
+        SUM(CASE WHEN realized_imb IS NOT NULL THEN pnl_ron END) pnl, SUM(CASE WHEN realized_imb IS NOT NULL THEN ABS(qty) END) mwh
+        FROM combo_pred WHERE kind='intraday'`).get();
       if (ci && ci.n) comboTxt = `combo intraday (paper): <b>${ci.acc.toFixed(1)}%</b> vs persist ${ci.pacc !== null ? ci.pacc.toFixed(1) : '—'}% · n=${ci.n}${ci.mwh ? ` · ${(ci.pnl / ci.mwh).toFixed(0)} RON/MWh` : ''}`;
-      else if (pend && pend.n) comboTxt = `combo intraday (paper): warming up · ${pend.n} frozen, awaiting settlement`;
+      else if (ci && ci.pend) comboTxt = `combo intraday (paper): warming up · ${ci.pend} frozen, awaiting settlement`;
     } catch { /* combo_pred not present yet */ }
     try {
       const pl = db.prepare('SELECT n, model_ok, persist_ok FROM pi_learn_state').get();
@@ -1951,11 +2099,28 @@ ${learnBanner}
 </body></html>`;
 }
 
+// PNGs are already DEFLATE-compressed: read once, keep the bytes, send them as stored (never through send()'s gzip)
+const ICONS = new Map();
+const icon = (name) => ICONS.get(name) || ICONS.set(name, fs.readFileSync(path.join(__dirname, 'assets', name))).get(name);
+
 const server = http.createServer(async (req, res) => {
   try {
     const url = new URL(req.url, 'http://localhost');
     const today = roDateIsp(new Date()).date;
-    const send = (code, type, body) => { res.writeHead(code, { 'Content-Type': type }); res.end(body); };
+    // page/API bodies over 1 KB go out gzipped when the client accepts it (the Predict/PI pages are large table markup
+    // re-fetched every few seconds; level 4 ≈ most of the size win for a fraction of the default level's CPU).
+    // Async gzip runs on libuv's thread pool, so concurrent polls compress in parallel off the event loop.
+    const gz = /\bgzip\b/.test(req.headers['accept-encoding'] || '');
+    const send = (code, type, body) => {
+      if (gz && body && body.length > 1024) {
+        zlib.gzip(body, { level: 4 }, (err, buf) => {
+          if (err) { res.writeHead(code, { 'Content-Type': type }); res.end(body); return; }
+          res.writeHead(code, { 'Content-Type': type, 'Content-Encoding': 'gzip', Vary: 'Accept-Encoding' }); res.end(buf);
+        });
+        return;
+      }
+      res.writeHead(code, { 'Content-Type': type }); res.end(body);
+    };
     const json = (o) => send(200, 'application/json', JSON.stringify(o));
 
     // unauthenticated routes
@@ -1976,8 +2141,9 @@ const server = http.createServer(async (req, res) => {
       }));
     }
     if (url.pathname === '/icon-180.png' || url.pathname === '/icon-512.png') {
-      res.writeHead(200, { 'Content-Type': 'image/png', 'Cache-Control': 'public, max-age=86400' });
-      return res.end(fs.readFileSync(path.join(__dirname, 'assets', url.pathname.slice(1))));
+      const png = icon(url.pathname.slice(1));
+      res.writeHead(200, { 'Content-Type': 'image/png', 'Content-Length': png.length, 'Cache-Control': 'public, max-age=86400' });
+      return res.end(png);
     }
     if (url.pathname === '/login') {
       if (req.method === 'POST') {
@@ -2044,43 +2210,28 @@ const server = http.createServer(async (req, res) => {
       const notifxb = sf && sf.plan !== null ? -sf.plan : null;
       // place the value in the interval its SCADA timestamp belongs to — lags the wall-clock interval by the feed
       // delay (~1 min), so early in a new interval it stays in the PREVIOUS row until the SCADA clock reaches it.
-      const si = sf && sf.ts ? senFilter.tsInterval(sf.ts) : null;
+      const si = sf ? sf.si : null;
       const soldIsp = (isp && si && si.date === qd) ? si.isp : isp; // null when not viewing today
       let avg = null, navg = 0;
       if (soldIsp) { const tw = intervalTWA(qd, soldIsp); avg = tw.avg; navg = tw.n; } // time-weighted by SCADA timestamps
       if (avg === null && sold !== null) avg = -sold; // seed with the live value so the average never blanks
       // live Notif X-B (DAMAS/PI commercial net export, freshest snapshot) so the client can refresh notif + Δ each poll
-      let notifPi = null; if (soldIsp) { try { const r = db.prepare('SELECT commercial FROM xb_pi_snap WHERE date_ro=? AND isp=? AND commercial IS NOT NULL ORDER BY pulled_at DESC LIMIT 1').get(qd, soldIsp); if (r) notifPi = r.commercial; } catch { /* table may be absent */ } }
+      let notifPi = null; if (soldIsp) { try { const r = _nbPi.get(qd, soldIsp); if (r) notifPi = r.commercial; } catch { /* table may be absent */ } }
       return json({ isp, soldIsp, sold, realxb: sold !== null ? -sold : null, notifxb, notifPi, prod: sf ? sf.prod : null, cons: sf ? sf.cons : null, solar: sf ? sf.solar : null, wind: sf ? sf.wind : null, hydro: sf ? sf.hydro : null, nuclear: sf ? sf.nuclear : null, avg, navg, plan: sf ? sf.plan : null, ts: sf && sf.ts ? sf.ts : new Date().toISOString() });
     }
-    if (url.pathname === '/api/pulse') {
-      // LIVE system-state nowcast from the freshest SCADA (sen_live table → no extra source load): dev = sold − plan
-      // (physical exchange vs plan) reads the settled imbalance at ~0.54 / 80% sign — import OVER plan → DEFICIT lean.
-      // ~1-min fresh. Plus the latest settled imbalance as the anchor + a TURN flag when the live read disagrees with it.
-      // Situational awareness + early-flip detection, NOT a 75-min forecast edge (validated: persistence still wins the anchor).
-      const recent = db.prepare('SELECT ts_ms, pulled_at, sold, plan FROM sen_live WHERE sold IS NOT NULL AND plan IS NOT NULL ORDER BY ts_ms DESC LIMIT 30').all();
-      if (!recent.length) return json({ ok: false });
-      const cur = recent[0], dev = cur.sold - cur.plan;       // ts_ms carries a +3h local-as-UTC offset (relative diffs ok); age uses pulled_at (true UTC)
-      const older = recent.find((r) => r.ts_ms <= cur.ts_ms - 10 * 60000);
-      const trend = older ? dev - (older.sold - older.plan) : null;       // rising dev = deficit deepening
-      const im = db.prepare("SELECT ts_utc, value FROM series WHERE series='damas_est_sys_imbalance' AND value IS NOT NULL ORDER BY ts_utc DESC LIMIT 1").get();
-      const anchor = im ? im.value : null;
-      const scadaSign = Math.abs(dev) < 25 ? '' : (dev > 0 ? 'D' : 'S');   // dev>0 = importing over plan = deficit lean
-      const anchorSign = anchor == null || Math.abs(anchor) < 10 ? '' : (anchor > 0 ? 'S' : 'D');
-      return json({ ok: true, ageS: Math.max(0, Math.round((Date.now() - Date.parse(cur.pulled_at)) / 1000)), dev: Math.round(dev), trend: trend == null ? null : Math.round(trend), scadaSign, anchor: anchor == null ? null : Math.round(anchor), anchorSign, anchorAgeMin: im ? Math.round((Date.now() - Date.parse(im.ts_utc)) / 60000) : null, turn: !!(scadaSign && anchorSign && scadaSign !== anchorSign) });
-    }
+    if (url.pathname === '/api/pulse') return json(pulseNow());
     if (url.pathname === '/api/xbpi') {
       // Full intraday history of the notified cross-border for one interval (the PI trades): every recorded frame
       // with its step Δ (sold = net export rose, bought = fell). Powers the ⓘ popup on the Notif cross border cell.
       const qd = url.searchParams.get('date') || today;
       const isp = +url.searchParams.get('isp');
       let frames = [];
-      try { frames = db.prepare('SELECT pulled_at, ts_utc, d1, pi, lt, commercial FROM xb_pi_snap WHERE date_ro=? AND isp=? ORDER BY pulled_at').all(qd, isp); } catch { /* table missing */ }
-      const cetClock = (iso) => new Date(iso).toLocaleTimeString('en-GB', { timeZone: 'Europe/Berlin', hour: '2-digit', minute: '2-digit', hour12: false });
-      let prev = null;
-      const out = frames.map((f) => { const deltaC = prev == null ? null : f.commercial - prev; prev = f.commercial; return { time: cetClock(f.pulled_at), commercial: f.commercial, pi: f.pi, deltaC, action: deltaC == null || Math.abs(deltaC) < 1 ? '' : (deltaC > 0 ? 'sold ' + Math.round(deltaC) : 'bought ' + Math.round(-deltaC)) }; });
+      try { frames = db.prepare('SELECT pulled_at, ts_utc, pi, commercial FROM xb_pi_snap WHERE date_ro=? AND isp=? ORDER BY pulled_at').all(qd, isp); } catch { /* table missing */ }
+      // only the columns the popup shows; rows destructured once and written into a pre-sized array
+      const out = new Array(frames.length); let prev = null;
+      for (let k = 0; k < frames.length; k++) { const { pulled_at, pi, commercial } = frames[k]; const deltaC = prev == null ? null : commercial - prev; prev = commercial; out[k] = { time: CET_HM.format(new Date(pulled_at)), commercial, pi, deltaC, action: deltaC == null || Math.abs(deltaC) < 1 ? '' : (deltaC > 0 ? 'sold ' + Math.round(deltaC) : 'bought ' + Math.round(-deltaC)) }; }
       let realized = null;
-      if (frames.length) { try { const r = db.prepare("SELECT value FROM series WHERE series='damas_est_sys_imbalance' AND ts_utc=?").get(frames[0].ts_utc); realized = r ? r.value : null; } catch { /* ignore */ } }
+      if (frames.length) realized = sv('damas_est_sys_imbalance', frames[0].ts_utc);
       let mm = (isp - 1) * 15 - 60; if (mm < 0) mm += 1440;
       return json({ isp, cet: `${pad(Math.floor(mm / 60))}:${pad(mm % 60)}`, frames: out, realized });
     }
@@ -2089,8 +2240,9 @@ const server = http.createServer(async (req, res) => {
       // running hit-rate, and the trailing MISS STREAK (the model "checking itself" — surfaces when it's off-trend
       // today so the forward calls can be discounted). Read-only; the forward probabilities already update each close.
       const qd = url.searchParams.get('date') || today;
-      const locks = db.prepare('SELECT isp, sign, conf FROM sign_lock WHERE date_ro=? ORDER BY isp').all(qd);
-      const imbStmt = db.prepare("SELECT value FROM series WHERE series='damas_est_sys_imbalance' AND date_ro=? AND isp=?");
+      _locksStmt = _locksStmt || db.prepare('SELECT isp, sign, conf FROM sign_lock WHERE date_ro=? ORDER BY isp');
+      const locks = _locksStmt.all(qd);
+      const imbStmt = _imbAtStmt;
       const rows = []; let hit = 0;
       for (const l of locks) { const im = imbStmt.get(qd, l.isp); if (!im || im.value == null) continue; const act = im.value > 0 ? 'S' : 'D'; const ok = act === l.sign; if (ok) hit++; rows.push({ isp: l.isp, pred: l.sign, conf: l.conf, act, ok }); }
       let streak = 0; for (let k = rows.length - 1; k >= 0; k--) { if (!rows[k].ok) streak++; else break; }
@@ -2104,8 +2256,10 @@ const server = http.createServer(async (req, res) => {
       const from = addDays(qd, -RES_DAYS) + 'T00:00:00Z', to = addDays(qd, 1) + 'T00:00:00Z';
       // fast: pre-materialized latest-run ensemble mean (weather_hourly), already deduped → agg holds {s:mean,n:1}
       const agg = {}; for (const r of db.prepare("SELECT ts_utc, var, value FROM weather_hourly WHERE var IN ('shortwave_radiation','wind_speed_100m') AND ts_utc>=? AND ts_utc<?").all(from, to)) agg[r.var + '|' + r.ts_utc] = { s: r.value, n: 1 };
-      const hg = (series) => { const m = {}; for (const r of db.prepare('SELECT ts_utc,value FROM series WHERE series=? AND ts_utc>=? AND ts_utc<? AND value IS NOT NULL').all(series, from, to)) { const h = r.ts_utc.slice(0, 13); (m[h] || (m[h] = { s: 0, n: 0 })).s += r.value; m[h].n++; } const o = {}; for (const h in m) o[h] = m[h].s / m[h].n; return o; };
-      const aS = hg('gen_actual_solar'), aW = hg('gen_actual_wind_onshore'), eS = hg('ws_fc_cur_solar'), eW = hg('ws_fc_cur_wind_onshore');
+      // hourly means of all 4 RES series from one grouped query (was a query + 2 JS passes per series)
+      const hg = { gen_actual_solar: {}, gen_actual_wind_onshore: {}, ws_fc_cur_solar: {}, ws_fc_cur_wind_onshore: {} };
+      for (const r of _resHourStmt.iterate(from, to)) hg[r.series][r.h] = r.v;
+      const aS = hg.gen_actual_solar, aW = hg.gen_actual_wind_onshore, eS = hg.ws_fc_cur_solar, eW = hg.ws_fc_cur_wind_onshore;
       const acc = { sol: { m: 0, e: 0, n: 0 }, win: { m: 0, e: 0, n: 0 }, tSol: { m: 0, e: 0, n: 0 }, tWin: { m: 0, e: 0, n: 0 } };
       for (const h in aS) { const rd = agg['shortwave_radiation|' + h + ':00:00Z']; if (!rd) continue; const mv = resModel.predictSolar(resM, rd.s / rd.n), a = aS[h], e = eS[h]; if (a == null || e == null || mv == null) continue; const td = h.slice(0, 10) === qd; acc.sol.m += Math.abs(mv - a); acc.sol.e += Math.abs(e - a); acc.sol.n++; if (td) { acc.tSol.m += Math.abs(mv - a); acc.tSol.e += Math.abs(e - a); acc.tSol.n++; } }
       for (const h in aW) { const wd = agg['wind_speed_100m|' + h + ':00:00Z']; if (!wd) continue; const mv = resModel.predictWind(resM, wd.s / wd.n), a = aW[h], e = eW[h]; if (a == null || e == null || mv == null) continue; const td = h.slice(0, 10) === qd; acc.win.m += Math.abs(mv - a); acc.win.e += Math.abs(e - a); acc.win.n++; if (td) { acc.tWin.m += Math.abs(mv - a); acc.tWin.e += Math.abs(e - a); acc.tWin.n++; } }
@@ -2120,7 +2274,7 @@ const server = http.createServer(async (req, res) => {
       const out = [];
       if (model) {
         const nowMs = Date.now();
-        const ni = roDateIsp(new Date()); const curTs = dayTimestamps(ni.date).find((t) => t.isp === ni.isp);
+        const ni = roDateIsp(new Date()); const curTs = ispTs(ni.date, ni.isp);
         const gateMs = (curTs ? new Date(curTs.ts).getTime() : nowMs) + 75 * signModel.MIN; // first TRADEABLE start (current-ISP start + 75min)
         const reg = liveRegime(nowMs - signModel.PUB_LAG * signModel.MIN);
         const persist = reg ? reg.persist : null;
@@ -2141,7 +2295,9 @@ const server = http.createServer(async (req, res) => {
           }
         }
       }
-      return json({ n: out.length, rows: out });
+      const body = { n: out.length, rows: out };
+      if (url.searchParams.get('pulse') === '1') { try { body.pulse = pulseNow(); } catch { body.pulse = { ok: false }; } }
+      return json(body);
     }
     if (url.pathname === '/api/panics') {
       // logged big-PI-repositioning events for a day + the accumulating validation: when realized sign FLIPPED vs
@@ -2172,8 +2328,20 @@ const server = http.createServer(async (req, res) => {
   }
 });
 
+// the Predict page polls several /api/* endpoints every few seconds: keep idle sockets open longer than Node's 5s
+// default (and longer than the fronting proxy's idle timeout) so polls reuse one connection instead of reconnecting
+server.keepAliveTimeout = 65000;
+server.headersTimeout = 66000; // must exceed keepAliveTimeout
 const LISTEN_PORT = Number(process.env.PORT || PORT);
-server.listen(LISTEN_PORT, '0.0.0.0', () => console.log(`trading UI listening on :${LISTEN_PORT}`));
+// start today's live feeds while the first visitor is still connecting: after a deploy/restart the first Predict
+// render would otherwise wait on every upstream fetch cold (results land in the same caches the page reads)
+function prewarmLive() {
+  const d = roDateIsp(new Date()).date;
+  liveSEN(d).catch(() => {});
+  for (const c of PREDICT_REPORTS) liveReport(c, d).catch(() => {});
+  liveSenFilter().catch(() => {});
+}
+server.listen(LISTEN_PORT, '0.0.0.0', () => { console.log(`trading UI listening on :${LISTEN_PORT}`); prewarmLive(); });
 
 if (process.env.ENABLE_JOBS === '1') {
   require('./scheduler').start();
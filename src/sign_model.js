@@ -41,14 +41,19 @@ function train(db) {
   const nettingAt = (A) => { const e = expAt(A), i = impAt(A); return e == null || i == null ? 0 : e - i; };
   // notif_bal = notif_prod − notif_cons − net_export, read at the DELIVERY interval's own ts (forward schedules,
   // known at A; revised <5 MW so effectively gate-safe). exact-ts maps (no publication lag — these aren't settled reads).
-  const exactSer = (name) => { const m = new Map(); for (const r of db.prepare('SELECT ts_utc, value FROM series WHERE series=? AND value IS NOT NULL').all(name)) m.set(Date.parse(r.ts_utc), r.value); return (t) => (m.has(t) ? m.get(t) : null); };
+  const exactStmt = db.prepare('SELECT ts_utc, value FROM series WHERE series=? AND value IS NOT NULL');
+  const exactSer = (name) => { const m = new Map(); for (const r of exactStmt.iterate(name)) m.set(Date.parse(r.ts_utc), r.value); return (t) => (m.has(t) ? m.get(t) : null); };
   const npX = exactSer('damas_notif_prod'), ncX = exactSer('damas_notif_cons');
-  const EXP = ['sched_RO_HU', 'sched_RO_BG', 'sched_RO_RS', 'sched_RO_UA', 'sched_RO_MD'].map(exactSer);
-  const IMP = ['sched_HU_RO', 'sched_BG_RO', 'sched_RS_RO', 'sched_UA_RO', 'sched_MD_RO'].map(exactSer);
-  const notifBalAt = (t) => { const P = npX(t), C = ncX(t); if (P == null || C == null) return null; let e = 0, i = 0, a = false; for (const f of EXP) { const v = f(t); if (v != null) { e += v; a = true; } } for (const f of IMP) { const v = f(t); if (v != null) { i += v; a = true; } } return a ? P - C - (e - i) : null; };
+  // net scheduled export summed over the 10 border legs ONCE per ts in SQL (a ts is present iff any leg is) — one
+  // lookup per call instead of probing 10 per-border maps twice each
+  const schedNet = new Map();
+  for (const r of db.prepare(`SELECT ts_utc, TOTAL(CASE WHEN series LIKE 'sched_RO_%' THEN value ELSE -value END) v FROM series
+    WHERE series IN ('sched_RO_HU','sched_RO_BG','sched_RO_RS','sched_RO_UA','sched_RO_MD','sched_HU_RO','sched_BG_RO','sched_RS_RO','sched_UA_RO','sched_MD_RO')
+    AND value IS NOT NULL GROUP BY ts_utc`).iterate()) schedNet.set(Date.parse(r.ts_utc), r.v);
+  const notifBalAt = (t) => { const P = npX(t), C = ncX(t); if (P == null || C == null) return null; const net = schedNet.get(t); return net === undefined ? null : P - C - net; };
   // PI snapshots (commercial repositioning), indexed by interval ts — present only on the recent tail
   const piByMs = new Map();
-  for (const s of db.prepare('SELECT ts_utc, isp, pulled_at, commercial FROM xb_pi_snap ORDER BY ts_utc, pulled_at').all()) {
+  for (const s of db.prepare('SELECT ts_utc, isp, pulled_at, commercial FROM xb_pi_snap ORDER BY ts_utc, pulled_at').iterate()) {
     const t = Date.parse(s.ts_utc); (piByMs.get(t) || piByMs.set(t, []).get(t)).push({ p: Date.parse(s.pulled_at), c: s.commercial });
   }
   const roDateIsp = require('./db').roDateIsp;
@@ -12,7 +12,7 @@
 // differs slightly — CINTA file is ground truth for economics, revisit in backtest).
 const fs = require('fs');
 const path = require('path');
-const { openDb } = require('./db');
+const { openDb, roDateIsp } = require('./db');
 const { buildContext, featuresFor, FEATURE_NAMES, MIN } = require('./features');
 
 const FROM = process.argv[2] || '2024-08-01';
@@ -89,7 +89,7 @@ function main() {
     // price/imbalance quantiles: trailing 120 days only (older regimes distort the levels),
     // holdout included — quantile tables are not what the holdout evaluates
     if (target.getTime() > Date.now() - 120 * 86400000) {
-      const { isp } = require('./db').roDateIsp(target);
+      const { isp } = roDateIsp(target);
       const key = Math.floor((isp - 1) / 12) + '|' + y;
       if (p !== undefined && p !== null) (priceBuckets[key] = priceBuckets[key] || []).push(p);
       (imbBuckets[key] = imbBuckets[key] || []).push(yImb);
@@ -115,6 +115,7 @@ function main() {
       // recover isp from sin/cos is messy; approximate climatology from holdout-independent priceBuckets keys instead
     });
     const longShare = y.reduce((a, b) => a + b, 0) / y.length;
+    const recentIdx = FEATURE_NAMES.indexOf('recent_imb_45m');
     for (const h of hold) {
       const xn = applyNorm(h.x);
       let z = 0;
@@ -128,7 +129,7 @@ function main() {
       if (big) { nBig++; if (pred === h.y) okBig++; }
       if (confident && big) { nConfBig++; if (pred === h.y) okConfBig++; }
       if ((longShare > 0.5 ? 1 : 0) === h.y) okClim++;
-      const recent = h.x[FEATURE_NAMES.indexOf('recent_imb_45m')];
+      const recent = h.x[recentIdx];
       if ((Number.isFinite(recent) && recent > 0 ? 1 : 0) === h.y) okPersist++;
       n++;
     }
@@ -12,4 +12,6 @@ const now = new Date().toISOString();
 const t = (name, fn) => { const s = Date.now(); try { const m = fn(); up.run(name, JSON.stringify(m), now); console.log(`${name}: trained + cached in ${Date.now() - s}ms`); } catch (e) { console.error(`${name} train failed:`, e.message); } };
 t('sign', () => sign.train(db));
 t('res', () => res.train(db));
+// refresh planner statistics for tables whose indexes changed enough to matter (cheap no-op otherwise)
+try { db.exec('PRAGMA optimize'); } catch (e) { console.error('optimize:', e.message); }
 try { db.prepare('PRAGMA wal_checkpoint(TRUNCATE)').get(); console.log('wal_checkpoint(TRUNCATE) done'); } catch (e) { console.error('checkpoint:', e.message); }
@@ -3,7 +3,7 @@
 // Handles the Drive "can't scan for viruses" interstitial automatically.
 const fs = require('fs');
 const path = require('path');
-const { execFileSync } = require('child_process');
+const { Worker } = require('worker_threads');
 
 const FILE_ID = '1SMp--PkGbTtNn98F-LG_QqmK6KHpoXik';
 const OUT = path.join(__dirname, '..', 'data', 'oferte', 'OferteCentralizare.xlsx');
@@ -28,7 +28,11 @@ async function download() {
   const buf = await download();
   fs.writeFileSync(OUT, buf);
   console.log(`downloaded ${(buf.length / 1e6).toFixed(1)} MB -> ${OUT}`);
-  execFileSync(process.execPath, ['--max-old-space-size=6144', path.join(__dirname, 'pull_oferte.js'), OUT], {
-    stdio: 'inherit',
+  // parse on a worker thread rather than a second node process (no extra fork+exec/startup); the worker keeps the
+  // parser's own heap cap, and its console output is relayed through this process
+  await new Promise((resolve, reject) => {
+    const w = new Worker(path.join(__dirname, 'pull_oferte.js'), { argv: [OUT], resourceLimits: { maxOldGenerationSizeMb: 6144 } });
+    w.on('error', reject);
+    w.on('exit', (code) => (code ? reject(new Error(`pull_oferte exited with code ${code}`)) : resolve()));
   });
 })().catch((e) => { console.error(e); process.exit(1); });
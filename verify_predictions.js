@@ -1,6 +1,6 @@
 // Remote check: are predictions refreshing, and do they track the live imbalance trend?
-const { DatabaseSync } = require('node:sqlite');
-const db = new DatabaseSync('/data/market.db');
+const { openDb } = require('./src/db');
+const db = openDb({ readOnly: true }); // DATA_DIR=/data on Render → the same shared, tuned read-only handle
 
 const runs = db.prepare(`
   SELECT DISTINCT run_at FROM predictions ORDER BY run_at DESC LIMIT 5
@@ -16,12 +16,17 @@ console.log('recent system imbalance (newest first):', JSON.stringify(recent));
 
 // how prob_long for the NEXT few upcoming ISPs evolved across the last 3 runs
 const next = db.prepare(`
-  SELECT ts_utc FROM predictions WHERE run_at=? AND ts_utc > datetime('now') ORDER BY ts_utc LIMIT 4
+  SELECT ts_utc FROM predictions WHERE run_at=? AND ts_utc > strftime('%Y-%m-%dT%H:%M:%S.000Z','now') ORDER BY ts_utc LIMIT 4
 `).all(runs[0]).map((r) => r.ts_utc);
-for (const ts of next) {
-  const hist = db.prepare(`
-    SELECT run_at, prob_long FROM predictions WHERE ts_utc=? AND run_at IN (?,?,?)
-    ORDER BY run_at
-  `).all(ts, runs[2], runs[1], runs[0]);
-  console.log(ts, '->', hist.map((h) => `${h.run_at.slice(11, 16)}Z:${(h.prob_long * 100).toFixed(0)}%`).join(' '));
+// one query for all of them, grouped in JS, printed in a single write
+const hist = new Map(next.map((ts) => [ts, []]));
+if (next.length) {
+  for (const h of db.prepare(`
+    SELECT ts_utc, run_at, prob_long FROM predictions
+    WHERE ts_utc IN (${next.map(() => '?').join(',')}) AND run_at IN (?,?,?)
+    ORDER BY ts_utc, run_at
+  `).iterate(...next, runs[2], runs[1], runs[0])) {
+    hist.get(h.ts_utc).push(`${h.run_at.slice(11, 16)}Z:${(h.prob_long * 100).toFixed(0)}%`);
+  }
 }
+process.stdout.write([...hist].map(([ts, h]) => `${ts} -> ${h.join(' ')}\n`).join(''));
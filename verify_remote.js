@@ -1,12 +1,11 @@
 // Remote data verification (runs on the Render instance against /data/market.db).
-const { DatabaseSync } = require('node:sqlite');
-const db = new DatabaseSync('/data/market.db');
-const q = (sql) => db.prepare(sql).get();
-console.log(JSON.stringify({
-  series: q('SELECT COUNT(*) n FROM series').n,
-  offers: q('SELECT COUNT(*) n FROM offers').n,
-  predictions: q('SELECT COUNT(*) n FROM predictions').n,
-  bets: q('SELECT COUNT(*) n FROM bets').n,
-  user_bets: q('SELECT COUNT(*) n FROM user_bets').n,
-  latest_damas: q(`SELECT MAX(ts_utc) m FROM series WHERE series='damas_est_sys_imbalance'`).m,
-}));
+const { openDb } = require('./src/db');
+const db = openDb({ readOnly: true }); // DATA_DIR=/data on Render → the same shared, tuned read-only handle
+// one statement with scalar subqueries instead of six prepare/step round-trips
+console.log(JSON.stringify({ ...db.prepare(`SELECT
+  (SELECT COUNT(*) FROM series) series,
+  (SELECT COUNT(*) FROM offers) offers,
+  (SELECT COUNT(*) FROM predictions) predictions,
+  (SELECT COUNT(*) FROM bets) bets,
+  (SELECT COUNT(*) FROM user_bets) user_bets,
+  (SELECT MAX(ts_utc) FROM series WHERE series='damas_est_sys_imbalance') latest_damas`).get() }));